@@ -0,0 +1,233 @@
+"""
+Load generator for the Azure analysis path
+
+Starts query flows (NLP analysis then insight generation, as a submitted
+query runs) at a fixed rate against a Text Analytics endpoint - by default
+the bundled local mock - and reports throughput and tail latency. Flows go
+through the same rate limiter as the app but bypass the result cache, so
+every flow reaches the endpoint.
+
+Latency is measured from each flow's scheduled start, so time spent queued
+behind a saturated client counts against the tail.
+
+Query flows need src.nlp_processor and insight generation needs
+src.insights_generator. Where a checkout lacks them, the generator says so
+and exits; `--mode batch --analysis-only` needs neither.
+
+Usage:
+    python scripts/load_generator.py --rps 20 --duration 30
+    python scripts/load_generator.py --mode batch --batch-size 25 --rps 2 --latency-ms 60 --max-rps 15
+    python scripts/load_generator.py --mode batch --analysis-only --rps 5
+    AZURE_TEXT_ANALYTICS_KEY=... python scripts/load_generator.py --endpoint https://<resource>.cognitiveservices.azure.com
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mock_text_analytics import MockTextAnalyticsServer, add_behavior_arguments, behavior_from_args  # noqa: E402
+from perf_benchmark import synthetic_feedback  # noqa: E402
+from src.latency import percentile  # noqa: E402
+from src.rate_limiter import RateLimiter  # noqa: E402
+
+DEFAULT_RPS = 10.0
+DEFAULT_DURATION_SECONDS = 10.0
+DEFAULT_CONCURRENCY = 32
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_DISTINCT_TEXTS = 500
+
+
+def make_query_flow(endpoint, key, rate_limiter=None, insights_generator=None):
+    """One query: NLPProcessor analysis (through the limiter, as the app does) then insight generation"""
+    from src.nlp_processor import NLPProcessor
+
+    processor = NLPProcessor(endpoint, key)
+
+    def flow(text):
+        if rate_limiter is not None:
+            # NLPProcessor's client retries on its own (SDK default policy); don't multiply its retries
+            nlp_result = rate_limiter.call((endpoint, "query"), processor.process_natural_language_query, text,
+                                           max_retries=0)
+        else:
+            nlp_result = processor.process_natural_language_query(text)
+        if not nlp_result:
+            raise ValueError("No NLP result returned")
+        if insights_generator is not None:
+            insights_generator.generate_insight({"text": text, "timestamp": datetime.now().isoformat()}, nlp_result)
+
+    return flow
+
+
+def make_batch_flow(endpoint, key, rate_limiter=None, insights_generator=None):
+    """One batch: BatchTextAnalyzer over several texts then an insight per text"""
+    from src.batch_analysis import BatchTextAnalyzer
+
+    analyzer = BatchTextAnalyzer.from_credentials(endpoint, key, rate_limiter=rate_limiter)
+
+    def flow(texts):
+        results = analyzer.analyze_batch(texts)
+        failed = [result for result in results if result["errors"] or not result["sentiment"]]
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(texts)} documents failed: {failed[0]['errors'][:1]}")
+        if insights_generator is not None:
+            timestamp = datetime.now().isoformat()
+            for text, nlp_result in zip(texts, results):
+                insights_generator.generate_insight({"text": text, "timestamp": timestamp}, nlp_result)
+
+    return flow
+
+
+def run_load(flow, payloads, rps, duration, concurrency=DEFAULT_CONCURRENCY, clock=time.perf_counter,
+             sleep=time.sleep):
+    """Start len(payloads)-cycling flows at rps for duration seconds (open loop).
+
+    Returns (outcomes, elapsed_seconds); each outcome is
+    (latency_seconds, service_seconds, error or None).
+    """
+    total = max(int(rps * duration), 1)
+    outcomes = []
+    lock = threading.Lock()
+
+    def run_one(payload, scheduled):
+        began = clock()
+        error = None
+        try:
+            flow(payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = clock()
+        with lock:
+            outcomes.append((finished - scheduled, finished - began, error))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = clock()
+        for i in range(total):
+            scheduled = started + i / rps
+            delay = scheduled - clock()
+            if delay > 0:
+                sleep(delay)
+            executor.submit(run_one, payloads[i % len(payloads)], scheduled)
+    return outcomes, clock() - started
+
+
+def _latency_summary(seconds):
+    values = sorted(seconds)
+    if not values:
+        return {}
+    return {
+        "mean": round(sum(values) / len(values) * 1000, 2),
+        "p50": round(percentile(values, 0.5) * 1000, 2),
+        "p95": round(percentile(values, 0.95) * 1000, 2),
+        "p99": round(percentile(values, 0.99) * 1000, 2),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+def summarize(outcomes, elapsed, target_rps, items_per_flow=1):
+    """Throughput, error breakdown and latency percentiles (ms) of successful flows"""
+    succeeded = [outcome for outcome in outcomes if outcome[2] is None]
+    errors = Counter(outcome[2].split(":", 1)[0] for outcome in outcomes if outcome[2] is not None)
+    return {
+        "target_rps": target_rps,
+        "flows": len(outcomes),
+        "succeeded": len(succeeded),
+        "failed": len(outcomes) - len(succeeded),
+        "errors": dict(errors.most_common()),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(succeeded) / elapsed, 2) if elapsed > 0 else 0.0,
+        "items_per_second": round(len(succeeded) * items_per_flow / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": _latency_summary([outcome[0] for outcome in succeeded]),
+        "service_ms": _latency_summary([outcome[1] for outcome in succeeded]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive query or batch analysis flows at a target rate")
+    parser.add_argument("--endpoint", default=None,
+                        help="Text Analytics endpoint (default: start the local mock; key from "
+                             "AZURE_TEXT_ANALYTICS_KEY)")
+    parser.add_argument("--mode", choices=("query", "batch"), default="query",
+                        help="query: NLPProcessor per text; batch: BatchTextAnalyzer per --batch-size texts")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS, help="Flows started per second")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_SECONDS, help="Seconds to generate load")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Flows in flight at most")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Texts per batch flow")
+    parser.add_argument("--texts", type=int, default=DEFAULT_DISTINCT_TEXTS, help="Distinct synthetic texts")
+    parser.add_argument("--no-rate-limit", action="store_true",
+                        help="Call the client directly instead of through the app's rate limiter")
+    parser.add_argument("--analysis-only", action="store_true", help="Skip insight generation")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    mock_options = parser.add_argument_group("local mock (ignored with --endpoint)")
+    add_behavior_arguments(mock_options)
+    args = parser.parse_args(argv)
+
+    rate_limiter = None if args.no_rate_limit else RateLimiter.from_env()
+    insights_generator = None
+    if not args.analysis_only:
+        try:
+            from src.insights_generator import InsightsGenerator
+        except ImportError as e:
+            print(f"Insight generation unavailable: {e} (rerun with --analysis-only)", file=sys.stderr)
+            return 2
+        insights_generator = InsightsGenerator()
+
+    texts = synthetic_feedback(args.texts)
+    if args.mode == "batch":
+        payloads = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+        make_flow = make_batch_flow
+    else:
+        payloads = texts
+        make_flow = make_query_flow
+
+    server = None if args.endpoint else MockTextAnalyticsServer(**behavior_from_args(args))
+    with server or nullcontext():
+        endpoint = args.endpoint or server.endpoint
+        key = os.getenv("AZURE_TEXT_ANALYTICS_KEY", "mock-key") if args.endpoint else "mock-key"
+        try:
+            flow = make_flow(endpoint, key, rate_limiter, insights_generator)
+        except ImportError as e:
+            print(f"{args.mode.capitalize()} flows unavailable: {e} (try --mode batch)", file=sys.stderr)
+            return 2
+        outcomes, elapsed = run_load(flow, payloads, args.rps, args.duration, args.concurrency)
+
+    report = summarize(outcomes, elapsed, args.rps, args.batch_size if args.mode == "batch" else 1)
+    report["mode"] = args.mode
+    if server is not None:
+        report["mock"] = server.stats()
+    if rate_limiter is not None:
+        report["rate_limiter"] = rate_limiter.stats()
+
+    latency = report["latency_ms"]
+    print(f"{report['succeeded']}/{report['flows']} {args.mode} flows succeeded in {report['elapsed_seconds']:.1f}s: "
+          f"{report['throughput_per_second']:.1f}/s (target {args.rps:g}/s), "
+          f"{report['items_per_second']:.1f} texts/s")
+    if latency:
+        print(f"Latency ms: p50 {latency['p50']:.1f} • p95 {latency['p95']:.1f} • p99 {latency['p99']:.1f} "
+              f"• max {latency['max']:.1f}")
+    for error, count in report["errors"].items():
+        print(f"  {count} x {error}")
+    if "mock" in report:
+        mock = report["mock"]
+        print(f"Mock endpoint: {mock['requests']} requests, {mock['throttled']} throttled, "
+              f"{mock['errors']} errors, {mock['rejected']} rejected batches")
+    if "rate_limiter" in report:
+        limits = report["rate_limiter"]
+        print(f"Rate limiter: {limits['queued']} queued, {limits['retried']} retried, {limits['failed']} failed")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["succeeded"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
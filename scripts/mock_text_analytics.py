@@ -0,0 +1,294 @@
+"""
+Local mock of the Azure Text Analytics REST API
+
+Answers sentiment, key phrase and entity requests with demo analyzer results
+so Azure-backed code paths can be benchmarked without credentials or quota.
+Both the v3.x routes (/text/analytics/v3.1/sentiment, ...) and the unified
+language route (/language/:analyze-text) used by newer SDK versions are served.
+Latency, 429 throttling (random or from a requests-per-second quota), 500
+errors and the per-request document limits of the real service can be
+simulated.
+
+Usage:
+    python scripts/mock_text_analytics.py --port 5005
+    python scripts/mock_text_analytics.py --latency-ms 80 --jitter-ms 40 --max-rps 20 --error-rate 0.01
+    AZURE_TEXT_ANALYTICS_ENDPOINT=http://127.0.0.1:5005 AZURE_TEXT_ANALYTICS_KEY=mock streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.batch_analysis import MAX_DOCUMENTS_PER_REQUEST  # noqa: E402
+from src.demo_analyzer import analyze_text_demo  # noqa: E402
+from src.rate_limiter import TokenBucket  # noqa: E402
+
+MODEL_VERSION = "mock-2024-01-01"
+
+# Last path segment of each v3.x route -> action
+V3_ACTIONS = {
+    "sentiment": "sentiment",
+    "keyPhrases": "key_phrases",
+    "general": "entities",
+}
+
+# analyze-text "kind" -> (action, response kind)
+ANALYZE_TEXT_KINDS = {
+    "SentimentAnalysis": ("sentiment", "SentimentAnalysisResults"),
+    "KeyPhraseExtraction": ("key_phrases", "KeyPhraseExtractionResults"),
+    "EntityRecognition": ("entities", "EntityRecognitionResults"),
+}
+
+CAPITALIZED_RE = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*")
+
+
+def _scores(confidence_scores):
+    return {name: confidence_scores[name] for name in ("positive", "neutral", "negative")}
+
+
+def sentiment_document(document):
+    text = document.get("text", "")
+    sentiment = analyze_text_demo(text)["sentiment"]
+    scores = _scores(sentiment["confidence_scores"])
+    return {
+        "id": document["id"],
+        "sentiment": sentiment["sentiment"],
+        "confidenceScores": scores,
+        "sentences": [{
+            "text": text,
+            "sentiment": sentiment["sentiment"],
+            "confidenceScores": scores,
+            "offset": 0,
+            "length": len(text),
+        }],
+        "warnings": [],
+    }
+
+
+def key_phrases_document(document):
+    return {
+        "id": document["id"],
+        "keyPhrases": analyze_text_demo(document.get("text", ""))["key_phrases"],
+        "warnings": [],
+    }
+
+
+def entities_document(document):
+    entities = [
+        {
+            "text": match.group(0),
+            "category": "Organization",
+            "offset": match.start(),
+            "length": len(match.group(0)),
+            "confidenceScore": 0.8,
+        }
+        for match in CAPITALIZED_RE.finditer(document.get("text", ""))
+    ]
+    return {"id": document["id"], "entities": entities, "warnings": []}
+
+
+DOCUMENT_HANDLERS = {
+    "sentiment": sentiment_document,
+    "key_phrases": key_phrases_document,
+    "entities": entities_document,
+}
+
+
+def analyze_documents(action, documents):
+    """Return the v3.x response body for one action over documents"""
+    handler = DOCUMENT_HANDLERS[action]
+    return {"documents": [handler(document) for document in documents], "errors": [], "modelVersion": MODEL_VERSION}
+
+
+class MockTextAnalyticsHandler(BaseHTTPRequestHandler):
+    """Routes POSTs to the v3.x or analyze-text handlers; counts requests on the server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": {"code": "InvalidRequest", "message": "Request body is not valid JSON"}})
+            return
+
+        path = urlsplit(self.path).path
+        if path.endswith("/:analyze-text"):
+            action, kind = ANALYZE_TEXT_KINDS.get(body.get("kind"), (None, None))
+            documents = (body.get("analysisInput") or {}).get("documents", [])
+        else:
+            action, kind = V3_ACTIONS.get(path.rsplit("/", 1)[-1]), None
+            documents = body.get("documents", [])
+        if action is None:
+            self._send(404, {"error": {"code": "NotFound", "message": f"Unsupported route {self.path}"}})
+            return
+
+        failure = self.server.admit(action, len(documents))
+        if failure is not None:
+            status, payload, headers = failure
+            self._send(status, payload, headers)
+            return
+        results = analyze_documents(action, documents)
+        self._send(200, {"kind": kind, "results": results} if kind else results)
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _error(code, message):
+    return {"error": {"code": code, "message": message}}
+
+
+class MockTextAnalyticsServer(ThreadingHTTPServer):
+    """Threaded mock server; use as a context manager to run it in the background.
+
+    Every request waits latency_ms plus up to jitter_ms. Requests beyond
+    max_rps (a token bucket with a one-second burst), or picked at
+    throttle_rate, get a 429 with Retry-After; requests picked at error_rate
+    get a 500. Batches larger than the service's per-action document limit
+    get a 400, as the real endpoint does.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 throttle_rate=0.0, max_rps=None, retry_after_seconds=1, max_documents=None, seed=None):
+        super().__init__((host, port), MockTextAnalyticsHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.max_documents = dict(MAX_DOCUMENTS_PER_REQUEST)
+        if max_documents:
+            self.max_documents.update(max_documents)
+        self._quota = TokenBucket(max_rps, max_rps) if max_rps else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.requests = 0
+        self.documents = 0
+        self.throttled = 0
+        self.errors = 0
+        self.rejected = 0
+
+    @property
+    def endpoint(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self, action, documents):
+        """Apply simulated latency and failures; returns (status, payload, headers) to fail the request, or None"""
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+        limit = self.max_documents[action]
+        if documents > limit:
+            self._count("rejected")
+            return 400, _error("InvalidDocumentBatch", f"Batch request contains too many records. "
+                                                       f"Max {limit} records are permitted."), None
+        if (self._quota is not None and not self._quota.try_take()) or roll < self.throttle_rate:
+            self._count("throttled")
+            message = f"Rate limit is exceeded. Try again in {self.retry_after_seconds} seconds."
+            return 429, _error("429", message), {"Retry-After": str(self.retry_after_seconds)}
+        if roll < self.throttle_rate + self.error_rate:
+            self._count("errors")
+            return 500, _error("InternalServerError", "Simulated internal server error"), None
+        with self._lock:
+            self.documents += documents
+        return None
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "documents": self.documents,
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "rejected": self.rejected,
+            }
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+def add_behavior_arguments(parser):
+    """Add the simulated latency/failure options (shared with the load generator)"""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random latency, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--max-rps", type=float, default=None,
+                        help="Requests per second quota; requests above it get HTTP 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and failure injection")
+
+
+def behavior_from_args(args):
+    return {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "max_rps": args.max_rps,
+        "retry_after_seconds": args.retry_after,
+        "seed": args.seed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Azure Text Analytics REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    add_behavior_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockTextAnalyticsServer(args.host, args.port, **behavior_from_args(args))
+    print(f"Mock Text Analytics listening on {server.endpoint}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
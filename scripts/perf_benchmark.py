@@ -0,0 +1,411 @@
+"""
+Performance benchmarks for analysis, insight generation, history and charts
+
+Builds synthetic insight histories, times the work the app does on them and
+writes the timings as JSON so runs on different commits can be compared.
+Azure-backed analysis is timed against a local mock Text Analytics endpoint.
+A benchmark section that cannot run stops the suite with exit status 2
+rather than being left out of the report.
+
+Usage:
+    python scripts/perf_benchmark.py --json bench.json
+    python scripts/perf_benchmark.py --sizes 1000 100000 1000000 --baseline bench.json
+    python scripts/perf_benchmark.py --stub-missing --no-azure
+"""
+
+import argparse
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from mock_text_analytics import MockTextAnalyticsServer  # noqa: E402
+from startup_benchmark import SERVICE_MODULES  # noqa: E402
+from src.demo_analyzer import (  # noqa: E402
+    analyze_series_demo,
+    analyze_text_demo,
+    analyze_texts_demo_serial,
+    analyze_texts_vectorized,
+)
+from src.history_aggregates import HistoryAggregates  # noqa: E402
+from src.history_export import export_csv, export_json, iter_history_chunks  # noqa: E402
+from src.history_store import open_history_backend  # noqa: E402
+from src.insight_store import InsightStore  # noqa: E402
+
+DEFAULT_SIZES = (1000, 100_000)
+DEFAULT_TEXTS = 1000
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_REGRESSION = 0.25
+
+# Histories at least this large are timed once per benchmark
+SINGLE_RUN_SIZE = 100_000
+
+# Benchmarks faster than this in the baseline are too noisy to flag
+MIN_COMPARABLE_MS = 1.0
+
+ADJECTIVES = ("slow", "late", "broken", "helpful", "friendly", "confusing", "expensive", "fast",
+              "missing", "great", "poor", "new", "old", "mobile", "online", "monthly")
+NOUNS = ("delivery", "support", "checkout", "billing", "app", "website", "refund", "order",
+         "account", "search", "login", "invoice", "shipping", "pricing", "update", "service")
+TOPICS = tuple(f"{adjective} {noun}" for adjective in ADJECTIVES for noun in NOUNS)
+OPENERS = {
+    "positive": ("I love the", "Great experience with the", "Really happy with the", "Excellent work on the"),
+    "negative": ("Terrible experience with the", "I am disappointed by the", "Awful", "Really unhappy with the"),
+    "neutral": ("I noticed the", "A question about the", "Comment on the", "Regarding the"),
+}
+SENTIMENT_WEIGHTS = {"positive": 5, "negative": 3, "neutral": 2}
+
+
+class BenchmarkUnavailable(RuntimeError):
+    """A requested benchmark section cannot run in this environment"""
+
+
+# Stand-ins installed by stub_missing_modules, by module name
+_STUBS = {}
+
+
+def stub_missing_modules(stubs=SERVICE_MODULES):
+    """Stand in empty modules for app service modules missing from this checkout; returns the names stubbed"""
+    for name, attrs in stubs.items():
+        if name in sys.modules or importlib.util.find_spec(name) is not None:
+            continue
+        stub = types.ModuleType(name)
+        for attr in attrs:
+            setattr(stub, attr, type(attr, (), {}))
+        sys.modules[name] = _STUBS[name] = stub
+    return [name for name in stubs if name in _STUBS and sys.modules.get(name) is _STUBS[name]]
+
+
+def synthetic_feedback(count, seed=0):
+    """Return count feedback texts with a realistic mix of sentiment and topics"""
+    rng = random.Random(seed)
+    labels = rng.choices(list(SENTIMENT_WEIGHTS), weights=list(SENTIMENT_WEIGHTS.values()), k=count)
+    return [
+        f"{rng.choice(OPENERS[label])} {rng.choice(TOPICS)}; order {rng.randrange(10_000, 99_999)} "
+        f"and the {rng.choice(TOPICS)} were mentioned too."
+        for label in labels
+    ]
+
+
+def synthetic_insights(count, seed=0, start=datetime(2025, 1, 1), days=90):
+    """Yield count insights shaped like InsightsGenerator output, spread over days"""
+    rng = random.Random(seed)
+    # Skewed topic popularity, as in real feedback
+    topic_weights = [1 / (rank + 1) for rank in range(len(TOPICS))]
+    span_seconds = days * 86400
+    for i in range(count):
+        label = rng.choices(list(SENTIMENT_WEIGHTS), weights=list(SENTIMENT_WEIGHTS.values()))[0]
+        confidence = round(rng.uniform(0.55, 0.99), 2)
+        rest = round(1 - confidence, 2)
+        others = [name for name in SENTIMENT_WEIGHTS if name != label]
+        scores = {label: confidence, others[0]: round(rest / 2, 2), others[1]: round(rest - round(rest / 2, 2), 2)}
+        topics = list(dict.fromkeys(rng.choices(TOPICS, weights=topic_weights, k=rng.randint(1, 4))))
+        yield {
+            "query": f"{rng.choice(OPENERS[label])} {topics[0]} (#{i})",
+            "timestamp": (start + timedelta(seconds=span_seconds * i // max(count, 1))).isoformat(),
+            "sentiment": {"sentiment": label, "confidence_scores": scores},
+            "confidence": confidence,
+            "key_topics": topics,
+            "summary": f"Feedback about {', '.join(topics)} is {label}.",
+            "recommendations": [f"Review {topic} feedback" for topic in topics[:2]],
+        }
+
+
+def measure(fn, setup=None, repeat=DEFAULT_REPEAT, items=None):
+    """Time fn(*setup()) repeat times; setup runs untimed before each call"""
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    result = {
+        "runs": repeat,
+        "median_ms": round(median * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+    }
+    if items:
+        result["items"] = items
+        result["items_per_second"] = round(items / median, 1) if median > 0 else None
+    return result
+
+
+def load_app():
+    """Import app.py for its chart, summary and persistence functions"""
+    try:
+        import app
+    except Exception as e:
+        raise BenchmarkUnavailable(f"import app failed: {e} (rerun with --stub-missing or --no-app)") from e
+    return app
+
+
+@contextmanager
+def app_history_backend(app, backend):
+    """Route app's session history wrappers to backend instead of the configured store"""
+    original = app.get_history_backend
+    app.get_history_backend = lambda: backend
+    try:
+        yield
+    finally:
+        app.get_history_backend = original
+
+
+def chart_functions(app):
+    """All create_* chart builders in app.py, with whether each takes the history or the aggregates"""
+    functions = {}
+    for name, fn in inspect.getmembers(app, inspect.isfunction):
+        if name.startswith("create_") and fn.__module__ == app.__name__:
+            first_param = next(iter(inspect.signature(fn).parameters))
+            functions[name] = (fn, first_param == "history")
+    return functions
+
+
+def bench_text_analysis(texts, repeat, stubbed=()):
+    """Time demo analysis and insight generation over texts (insight generation is left out when stubbed)"""
+    results = {
+        "analyze_text_demo": measure(lambda: [analyze_text_demo(text) for text in texts], repeat=repeat,
+                                     items=len(texts)),
+        "analyze_texts_demo_serial": measure(lambda: analyze_texts_demo_serial(texts), repeat=repeat,
+                                             items=len(texts)),
+        "analyze_texts_vectorized": measure(lambda: analyze_texts_vectorized(texts), repeat=repeat,
+                                            items=len(texts)),
+    }
+    # Columnar scoring alone, before the frame is turned back into result dicts
+    import pandas as pd
+
+    series = pd.Series(texts, dtype=object)
+    results["analyze_series_demo"] = measure(lambda: analyze_series_demo(series), repeat=repeat, items=len(texts))
+    if "src.insights_generator" in stubbed:
+        return results
+    try:
+        from src.insights_generator import InsightsGenerator
+    except ImportError as e:
+        raise BenchmarkUnavailable(f"InsightsGenerator unavailable: {e} (rerun with --stub-missing)") from e
+    else:
+        generator = InsightsGenerator()
+        nlp_results = [analyze_text_demo(text) for text in texts]
+        timestamp = datetime.now().isoformat()
+
+        def generate_all():
+            for text, nlp_result in zip(texts, nlp_results):
+                generator.generate_insight({"text": text, "timestamp": timestamp}, nlp_result)
+
+        results["generate_insight"] = measure(generate_all, repeat=repeat, items=len(texts))
+    return results
+
+
+def bench_azure_mock(texts, repeat, stubbed=()):
+    """Time Azure-backed analysis against a local mock Text Analytics endpoint"""
+    results = {}
+    try:
+        from src.batch_analysis import BatchTextAnalyzer
+        import azure.ai.textanalytics  # noqa: F401
+    except ImportError as e:
+        raise BenchmarkUnavailable(f"Azure SDK unavailable: {e} (rerun with --no-azure)") from e
+
+    with MockTextAnalyticsServer() as server:
+        analyzer = BatchTextAnalyzer.from_credentials(server.endpoint, "mock-key")
+        results["azure_mock_analyze_batch"] = measure(lambda: analyzer.analyze_batch(texts), repeat=repeat,
+                                                      items=len(texts))
+        if "src.nlp_processor" not in stubbed:
+            try:
+                from src.nlp_processor import NLPProcessor
+            except ImportError as e:
+                raise BenchmarkUnavailable(f"NLPProcessor unavailable: {e} (rerun with --stub-missing)") from e
+            processor = NLPProcessor(server.endpoint, "mock-key")
+            sample = texts[:100]
+            results["azure_mock_nlp_processor"] = measure(
+                lambda: [processor.process_natural_language_query(text) for text in sample], repeat=repeat,
+                items=len(sample)
+            )
+        results["azure_mock_analyze_batch"]["requests"] = server.requests
+    return results
+
+
+def bench_history(size, repeat, app=None):
+    """Time building, persisting, summarizing, charting and exporting a history of size insights"""
+    results = {}
+    if size >= SINGLE_RUN_SIZE:
+        repeat = 1
+    key = lambda name: f"{name}[{size}]"
+
+    insights = list(synthetic_insights(size))
+    results[key("insight_store_build")] = measure(lambda: InsightStore(insights), repeat=repeat, items=size)
+    history = InsightStore(insights)
+    del insights
+    results[key("history_aggregates_build")] = measure(lambda: HistoryAggregates(history), repeat=repeat, items=size)
+    aggregates = HistoryAggregates(history)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend_name in ("jsonl", "sqlite"):
+            run = itertools.count()
+
+            def fresh_backend():
+                suffix = next(run)
+                return (open_history_backend(
+                    backend_name, os.path.join(tmp_dir, f"{backend_name}-{suffix}.jsonl"),
+                    db_path=os.path.join(tmp_dir, f"{backend_name}-{suffix}.db")
+                ),)
+
+            def save(backend):
+                # The shared default partition, as sessions without a signed-in user see it
+                shared = backend.partition(None)
+                for chunk in iter_history_chunks(history):
+                    shared.append_many(chunk)
+
+            results[key(f"save_history_{backend_name}")] = measure(save, setup=fresh_backend, repeat=repeat,
+                                                                  items=size)
+            saved = fresh_backend()[0]
+            save(saved)
+            results[key(f"load_history_{backend_name}")] = measure(lambda: InsightStore(saved.partition(None).load()),
+                                                                  repeat=repeat, items=size)
+            if hasattr(saved, "close"):
+                saved.close()
+
+            if app is not None:
+                # The app's own wrappers, as record_insights and session start call them
+                def app_save(backend):
+                    with app_history_backend(app, backend):
+                        for chunk in iter_history_chunks(history):
+                            app.save_session_history(chunk)
+
+                results[key(f"app_save_session_history_{backend_name}")] = measure(
+                    app_save, setup=fresh_backend, repeat=repeat, items=size
+                )
+                saved = fresh_backend()[0]
+                app_save(saved)
+                with app_history_backend(app, saved):
+                    loaded = InsightStore(app.load_session_history())
+                    # The wrappers log and swallow errors, so check the round trip actually happened
+                    if len(loaded) != size:
+                        raise BenchmarkUnavailable(
+                            f"app session history round trip on {backend_name} returned {len(loaded)} of {size} rows"
+                        )
+                    results[key(f"app_load_session_history_{backend_name}")] = measure(
+                        lambda: InsightStore(app.load_session_history()), repeat=repeat, items=size
+                    )
+                if hasattr(saved, "close"):
+                    saved.close()
+
+    results[key("export_csv")] = measure(lambda: export_csv(history), repeat=repeat, items=size)
+    results[key("export_json")] = measure(lambda: export_json(history), repeat=repeat, items=size)
+
+    if app is not None:
+        results[key("get_summary_stats")] = measure(lambda: app.get_summary_stats(aggregates), repeat=repeat)
+        for name, (fn, takes_history) in chart_functions(app).items():
+            source = history if takes_history else aggregates
+            results[key(name)] = measure(lambda: fn(source), repeat=repeat)
+    return results
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(sizes=DEFAULT_SIZES, texts=DEFAULT_TEXTS, repeat=DEFAULT_REPEAT, include_app=True,
+              include_azure=True, stub_missing=False):
+    """Run every benchmark and return a JSON-serializable report.
+
+    Raises BenchmarkUnavailable when a requested section cannot run. With
+    stub_missing, absent service modules are stubbed so the rest of the app
+    can be timed; benchmarks of the stubbed modules themselves are listed
+    under "stubbed" instead.
+    """
+    stubbed = stub_missing_modules() if stub_missing else []
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": list(sizes),
+        "results": {},
+        "stubbed": stubbed,
+    }
+    feedback = synthetic_feedback(texts)
+    report["results"].update(bench_text_analysis(feedback, repeat, stubbed))
+    if include_azure:
+        report["results"].update(bench_azure_mock(feedback, repeat, stubbed))
+
+    app = load_app() if include_app else None
+    for size in sizes:
+        report["results"].update(bench_history(size, repeat, app))
+    return report
+
+
+def compare_reports(report, baseline, max_regression=DEFAULT_MAX_REGRESSION):
+    """Return messages for benchmarks whose median got slower than baseline by more than max_regression"""
+    problems = []
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or before["median_ms"] < MIN_COMPARABLE_MS:
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1
+        if change > max_regression:
+            problems.append(f"{name}: {before['median_ms']:.1f} ms -> {result['median_ms']:.1f} ms (+{change:.0%})")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark analysis, history, chart and export performance")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Synthetic history sizes (e.g. 1000 100000 1000000)")
+    parser.add_argument("--texts", type=int, default=DEFAULT_TEXTS, help="Texts per analysis benchmark")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per benchmark (median is reported)")
+    parser.add_argument("--no-app", action="store_true", help="Skip benchmarks that import app.py")
+    parser.add_argument("--no-azure", action="store_true", help="Skip the mock Azure endpoint benchmarks")
+    parser.add_argument("--stub-missing", action="store_true",
+                        help="Stand in empty modules for app service modules missing from this checkout")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the report to this file")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Allowed slowdown versus the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_suite(args.sizes, args.texts, args.repeat, not args.no_app, not args.no_azure,
+                           args.stub_missing)
+    except BenchmarkUnavailable as e:
+        print(f"Benchmark unavailable: {e}", file=sys.stderr)
+        return 2
+
+    for name, result in report["results"].items():
+        rate = f"  {result['items_per_second']:>12,.0f}/s" if result.get("items_per_second") else ""
+        print(f"{result['median_ms']:12.2f} ms  {name:<44}{rate}".rstrip())
+    for name in report["stubbed"]:
+        print(f"     stubbed  {name} (not benchmarked)")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    problems = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare_reports(report, json.load(f), args.max_regression)
+    for problem in problems:
+        print(f"REGRESSION: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
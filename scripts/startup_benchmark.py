@@ -0,0 +1,135 @@
+"""
+Startup import benchmark for app.py
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter, reports
+the slowest imports and fails if a heavy dependency is loaded at startup or
+the total import time exceeds a budget.
+
+Usage:
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --max-ms 1500 --json startup.json
+    python scripts/startup_benchmark.py --stub-missing
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded lazily by app.py; importing any of these at startup is a regression.
+# (Streamlit itself imports the lightweight plotly.graph_objects stub, and numpy backs the
+# session's columnar insight store, so neither is listed.)
+FORBIDDEN_AT_STARTUP = (
+    "pandas",
+    "pyarrow",
+    "plotly.express",
+    "requests",
+    "azure.ai.textanalytics",
+)
+
+# App service modules that may be absent from a checkout; --stub-missing stands in empty classes for them
+SERVICE_MODULES = {
+    "src.insights_generator": ("InsightsGenerator",),
+    "src.nlp_processor": ("NLPProcessor",),
+}
+
+STUB_PRELUDE = """
+import importlib.util, sys, types
+for name, attrs in {stubs!r}.items():
+    if importlib.util.find_spec(name) is None:
+        stub = types.ModuleType(name)
+        for attr in attrs:
+            setattr(stub, attr, type(attr, (), {{}}))
+        sys.modules[name] = stub
+"""
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into {module: (self_us, cumulative_us, depth)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|", 2)
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # Header line
+            continue
+        # One separator space, then two spaces of indentation per nesting level
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        modules.setdefault(name.strip(), (self_us, cumulative_us, depth))
+    return modules
+
+
+def measure_startup(module="app", cwd=REPO_ROOT, stubs=None):
+    """Import module in a fresh interpreter and return its parsed import timings.
+
+    stubs maps module names to attribute names; modules that cannot be found
+    are replaced by empty stand-ins first (see SERVICE_MODULES).
+    """
+    env = dict(os.environ, PYTHONPATH=str(cwd))
+    code = (STUB_PRELUDE.format(stubs=stubs) if stubs else "") + f"import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise RuntimeError(f"Importing {module} failed: {last_line}")
+    return parse_importtime(result.stderr)
+
+
+def check_startup(modules, module="app", max_ms=None, forbidden=FORBIDDEN_AT_STARTUP):
+    """Return a report dict and a list of regression messages"""
+    total_ms = modules.get(module, (0, 0, 0))[1] / 1000
+    loaded_forbidden = [name for name in forbidden if name in modules]
+    slowest = sorted(
+        ((name, cumulative / 1000) for name, (_, cumulative, depth) in modules.items() if depth == 1),
+        key=lambda item: item[1], reverse=True
+    )[:10]
+
+    problems = [f"{name} is imported at startup" for name in loaded_forbidden]
+    if max_ms is not None and total_ms > max_ms:
+        problems.append(f"import {module} took {total_ms:.0f} ms (budget {max_ms:.0f} ms)")
+    report = {
+        "module": module,
+        "total_ms": round(total_ms, 1),
+        "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest},
+        "forbidden_loaded": loaded_forbidden,
+    }
+    return report, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app.py cold-start import time")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if total import time exceeds this")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    parser.add_argument("--stub-missing", action="store_true",
+                        help="Stand in empty modules for app service modules missing from this checkout")
+    args = parser.parse_args(argv)
+
+    stubs = SERVICE_MODULES if args.stub_missing else None
+    report, problems = check_startup(measure_startup(args.module, stubs=stubs), args.module, args.max_ms)
+
+    print(f"import {args.module}: {report['total_ms']:.1f} ms")
+    for name, ms in report["slowest_imports_ms"].items():
+        print(f"  {ms:8.1f} ms  {name}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    for problem in problems:
+        print(f"REGRESSION: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
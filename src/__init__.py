@@ -0,0 +1,3 @@
+"""
+Natural Language to Governed Insights - core modules
+"""
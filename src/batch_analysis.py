@@ -0,0 +1,129 @@
+"""
+Batched, concurrent multi-document analysis against Azure Text Analytics
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Service limits on documents per synchronous request, by action
+MAX_DOCUMENTS_PER_REQUEST = {
+    "sentiment": 10,
+    "key_phrases": 10,
+    "entities": 5,
+}
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+class BatchTextAnalyzer:
+    """Run sentiment, key phrase and entity actions over many documents at once"""
+
+    def __init__(self, client, max_workers=DEFAULT_MAX_WORKERS, max_documents_per_request=None,
+                 rate_limiter=None, endpoint=""):
+        self.client = client
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.endpoint = endpoint
+        self.max_documents_per_request = dict(MAX_DOCUMENTS_PER_REQUEST)
+        if max_documents_per_request:
+            self.max_documents_per_request.update(max_documents_per_request)
+
+    @classmethod
+    def from_credentials(cls, endpoint, key, rate_limiter=None, **kwargs):
+        """Create an analyzer backed by a TextAnalyticsClient for the given endpoint"""
+        from azure.ai.textanalytics import TextAnalyticsClient
+        from azure.core.credentials import AzureKeyCredential
+
+        client_kwargs = {}
+        if rate_limiter is not None:
+            # The limiter owns retries; stacking the SDK's own retry policy would multiply them
+            client_kwargs["retry_total"] = 0
+        client = TextAnalyticsClient(endpoint=endpoint, credential=AzureKeyCredential(key), **client_kwargs)
+        return cls(client, rate_limiter=rate_limiter, endpoint=endpoint, **kwargs)
+
+    def analyze_batch(self, texts):
+        """Analyze texts and return one result dict per input, in input order.
+
+        Each result has the same shape as NLPProcessor.process_natural_language_query
+        output, plus an 'errors' list that is empty when every action succeeded.
+        """
+        texts = list(texts)
+        results = [
+            {"query": text, "sentiment": None, "key_phrases": [], "entities": [], "errors": []}
+            for text in texts
+        ]
+        if not texts:
+            return results
+
+        actions = {
+            "sentiment": (self.client.analyze_sentiment, self._apply_sentiment),
+            "key_phrases": (self.client.extract_key_phrases, self._apply_key_phrases),
+            "entities": (self.client.recognize_entities, self._apply_entities),
+        }
+        documents = [{"id": str(i), "text": text} for i, text in enumerate(texts)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for action, (call, apply) in actions.items():
+                size = self.max_documents_per_request[action]
+                for start, chunk in _chunks(documents, size):
+                    future = executor.submit(self._request, action, call, chunk)
+                    futures.append((action, apply, start, chunk, future))
+
+            for action, apply, start, chunk, future in futures:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.warning(f"Batch {action} request failed: {e}")
+                    for offset in range(len(chunk)):
+                        results[start + offset]["errors"].append({"action": action, "message": str(e)})
+                    continue
+                # Results come back in request order within a chunk
+                for offset, doc in enumerate(response):
+                    result = results[start + offset]
+                    if getattr(doc, "is_error", False):
+                        error = getattr(doc, "error", None)
+                        result["errors"].append({
+                            "action": action,
+                            "code": getattr(error, "code", None),
+                            "message": getattr(error, "message", str(error)),
+                        })
+                    else:
+                        apply(result, doc)
+
+        return results
+
+    def _request(self, action, call, chunk):
+        if self.rate_limiter is None:
+            return call(chunk)
+        return self.rate_limiter.call((self.endpoint, action), call, chunk)
+
+    @staticmethod
+    def _apply_sentiment(result, doc):
+        scores = doc.confidence_scores
+        result["sentiment"] = {
+            "sentiment": doc.sentiment,
+            "confidence_scores": {
+                "positive": scores.positive,
+                "neutral": scores.neutral,
+                "negative": scores.negative,
+            },
+        }
+
+    @staticmethod
+    def _apply_key_phrases(result, doc):
+        result["key_phrases"] = list(doc.key_phrases)
+
+    @staticmethod
+    def _apply_entities(result, doc):
+        result["entities"] = [
+            {"text": entity.text, "category": entity.category, "confidence_score": entity.confidence_score}
+            for entity in doc.entities
+        ]
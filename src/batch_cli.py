@@ -0,0 +1,224 @@
+"""
+Headless batch analysis of feedback files
+
+Usage:
+    python -m src.batch_cli feedback.csv -o insights.jsonl
+    python -m src.batch_cli feedback.jsonl -o insights.parquet --workers 8 --chunk-size 500
+"""
+
+import argparse
+import copy
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from src.demo_analyzer import ParallelDemoAnalyzer, analyze_texts_in_process
+from src.history_export import open_writer
+from src.near_duplicates import NearDuplicateClusterer, analyze_with_dedup, DEFAULT_THRESHOLD as DEFAULT_DEDUP_THRESHOLD
+from src.result_cache import ResultCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_WORKERS = 4
+
+# Analysis results remembered across chunks, so repeated texts anywhere in the file are analyzed once
+DEFAULT_CACHE_ENTRIES = 100000
+
+
+def read_records(path, text_field="text"):
+    """Stream feedback records from a CSV or JSON Lines file"""
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                yield row
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    yield record if isinstance(record, dict) else {text_field: record}
+
+
+def iter_chunks(records, chunk_size):
+    """Group an iterator of records into lists of at most chunk_size"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def make_chunk_analyzer(insights_generator, text_field="text", batch_analyzer=None, demo_analyzer=None,
+                        clusterer=None, result_cache=None):
+    """Return a function that turns a chunk of records into (insights, failures)"""
+    cache_mode = "azure" if batch_analyzer is not None else "demo"
+
+    def analyze_uncached(texts):
+        if batch_analyzer is not None:
+            return batch_analyzer.analyze_batch(texts)
+        if demo_analyzer is not None:
+            return demo_analyzer.analyze(texts)
+        return analyze_texts_in_process(texts)
+
+    def analyze_texts(texts):
+        if result_cache is None:
+            return analyze_uncached(texts)
+        keys = [make_cache_key(text, cache_mode, "batch_cli") for text in texts]
+        nlp_results = [result_cache.get(key) for key in keys]
+        # Each distinct missing text is analyzed once, wherever it repeats in the chunk
+        missing = {}
+        for i, nlp_result in enumerate(nlp_results):
+            if nlp_result is None:
+                missing.setdefault(keys[i], []).append(i)
+        if missing:
+            groups = list(missing.values())
+            for group, nlp_result in zip(groups, analyze_uncached([texts[group[0]] for group in groups])):
+                if nlp_result and not nlp_result.get("errors") and nlp_result.get("sentiment"):
+                    result_cache.put(keys[group[0]], nlp_result)
+                nlp_results[group[0]] = nlp_result
+                for i in group[1:]:
+                    nlp_results[i] = copy.deepcopy(nlp_result)
+        for text, nlp_result in zip(texts, nlp_results):
+            if nlp_result:
+                nlp_result["query"] = text
+        return nlp_results
+
+    def analyze_chunk(records):
+        texts = [str(record.get(text_field) or "").strip() for record in records]
+        if clusterer is None:
+            nlp_results, cluster_ids = analyze_texts(texts), [None] * len(texts)
+        else:
+            nlp_results, cluster_ids, _ = analyze_with_dedup(texts, analyze_texts, clusterer)
+
+        insights = []
+        failures = 0
+        for record, text, nlp_result, cluster in zip(records, texts, nlp_results, cluster_ids):
+            if not text or not nlp_result or nlp_result.get("errors") or not nlp_result.get("sentiment"):
+                failures += 1
+                continue
+            timestamp = record.get("timestamp") or record.get("date") or datetime.now().isoformat()
+            try:
+                insight = insights_generator.generate_insight({"text": text, "timestamp": timestamp}, nlp_result)
+            except Exception as e:
+                logger.warning(f"Failed to generate insight: {e}")
+                failures += 1
+                continue
+            if cluster is not None:
+                insight["cluster_id"] = cluster
+            insights.append(insight)
+        return insights, failures
+
+    return analyze_chunk
+
+
+def run_batch(records, analyze_chunk, writer, chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS):
+    """Analyze records chunk by chunk in parallel, writing results in input order.
+
+    At most 2 * workers chunks are in flight, so memory stays bounded regardless
+    of input size. Returns (rows_read, insights_written, failures).
+    """
+    rows = written = failures = 0
+    pending = deque()
+
+    def drain_one():
+        nonlocal written, failures
+        insights, chunk_failures = pending.popleft().result()
+        writer.write(insights)
+        written += len(insights)
+        failures += chunk_failures
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk in iter_chunks(records, chunk_size):
+            rows += len(chunk)
+            pending.append(executor.submit(analyze_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                drain_one()
+        while pending:
+            drain_one()
+
+    return rows, written, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a CSV or JSONL feedback file without the Streamlit UI")
+    parser.add_argument("input", help="Input feedback file (.csv or .jsonl)")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.jsonl or .parquet)")
+    parser.add_argument("--text-field", default="text", help="Column/key holding the feedback text")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per analysis chunk")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Chunks analyzed in parallel")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Demo mode worker processes (default: CPU count, 1 disables the process pool)")
+    parser.add_argument("--dedup-threshold", type=float, default=0,
+                        help="Analyze one text per cluster of near-duplicates at this Jaccard similarity "
+                             f"(e.g. {DEFAULT_DEDUP_THRESHOLD}; off by default); clusters are found within each chunk")
+    parser.add_argument("--dedup-mask-digits", action="store_true",
+                        help="Also cluster texts that differ only in numbers (order IDs, dates, amounts)")
+    parser.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help="Most recent distinct texts whose results are reused across chunks (0 disables)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    from src.insights_generator import InsightsGenerator
+
+    endpoint = os.getenv('AZURE_TEXT_ANALYTICS_ENDPOINT')
+    key = os.getenv('AZURE_TEXT_ANALYTICS_KEY')
+    batch_analyzer = None
+    demo_analyzer = None
+    if endpoint and key:
+        from src.batch_analysis import BatchTextAnalyzer
+        from src.rate_limiter import RateLimiter
+        batch_analyzer = BatchTextAnalyzer.from_credentials(endpoint, key, rate_limiter=RateLimiter.from_env())
+        logger.info("Using Azure Text Analytics")
+    else:
+        logger.info("Azure credentials not set - using demo analyzer")
+        # Chunks are already sized for dispatch, so each chunk goes to the pool whole and is scored in columnar form
+        demo_analyzer = ParallelDemoAnalyzer(args.processes, min_parallel_texts=0, min_chunk_texts=args.chunk_size)
+
+    clusterer = None
+    if args.dedup_threshold > 0:
+        clusterer = NearDuplicateClusterer(args.dedup_threshold, mask_digits=args.dedup_mask_digits)
+    result_cache = ResultCache(max_entries=args.cache_entries) if args.cache_entries > 0 else None
+    analyze_chunk = make_chunk_analyzer(
+        InsightsGenerator(), args.text_field, batch_analyzer, demo_analyzer, clusterer, result_cache
+    )
+    writer = open_writer(args.output)
+    started = time.perf_counter()
+    try:
+        rows, written, failures = run_batch(
+            read_records(args.input, args.text_field), analyze_chunk, writer, args.chunk_size, args.workers
+        )
+    finally:
+        writer.close()
+        if demo_analyzer is not None:
+            demo_analyzer.close()
+    elapsed = time.perf_counter() - started
+
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec): "
+          f"{written} insights written, {failures} skipped")
+    if clusterer is not None:
+        dedup = clusterer.stats()
+        print(f"Near-duplicates: {dedup['duplicates']} of {dedup['texts']} texts reused a cluster's analysis")
+    if result_cache is not None:
+        reused = result_cache.stats()["hits"]
+        print(f"Repeated texts: {reused} reused an earlier analysis")
+    if batch_analyzer is not None:
+        limits = batch_analyzer.rate_limiter.stats()
+        print(f"Azure requests: {limits['requests']} sent, {limits['queued']} queued, "
+              f"{limits['throttled']} throttled, {limits['retried']} retried, {limits['failed']} failed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Demo mode text analysis (mock responses, no Azure credentials needed)
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Below this many texts, process start-up and pickling cost more than they save
+PARALLEL_MIN_TEXTS = 2000
+
+# Chunks dispatched per worker, so uneven texts still balance across processes
+CHUNKS_PER_WORKER = 4
+
+# Measured break-even with row-by-row scoring is ~2k texts; from 5k the columnar path is clearly
+# ahead (~1.4x), as result-dict building dominates both paths
+VECTORIZED_MIN_TEXTS = 5000
+
+
+# Default lexicon: keyword -> weight
+POSITIVE_KEYWORDS = {
+    'excellent': 1.0, 'great': 1.0, 'good': 1.0, 'love': 1.0,
+    'amazing': 1.0, 'wonderful': 1.0, 'positive': 1.0, 'happy': 1.0,
+}
+NEGATIVE_KEYWORDS = {
+    'bad': 1.0, 'terrible': 1.0, 'poor': 1.0, 'disappointed': 1.0,
+    'awful': 1.0, 'hate': 1.0, 'negative': 1.0, 'unhappy': 1.0,
+}
+
+# Optional JSON file of the form {"positive": {"term": weight}, "negative": {...}}
+LEXICON_PATH_ENV = 'DEMO_LEXICON_PATH'
+
+# Words are runs of letters, digits, underscores and apostrophes, with outer apostrophes trimmed.
+# SPLIT_PATTERN_RE2 is the same separator for pyarrow's RE2 engine.
+SPLIT_RE = re.compile(r"[^\w']+")
+SPLIT_PATTERN_RE2 = r"[^\pL\pN_']+"
+
+
+def tokenize(text):
+    """Split lowercased text into words for lexicon matching"""
+    return [word for word in (part.strip("'") for part in SPLIT_RE.split(text.lower())) if word]
+
+
+class SentimentLexicon:
+    """Weighted keyword lexicon scored in a single pass over the words of a text.
+
+    Terms match on whole words only, so "good" does not match "goodbye".
+    Multi-word terms are matched as consecutive words, longest first. Scoring
+    cost depends on text length, not on the number of terms in the lexicon.
+    """
+
+    def __init__(self, positive, negative):
+        self.terms = {}
+        self.max_term_words = 1
+        for polarity, keywords in (('positive', positive), ('negative', negative)):
+            if not isinstance(keywords, dict):
+                keywords = {keyword: 1.0 for keyword in keywords}
+            for term, weight in keywords.items():
+                words = tokenize(term)
+                if words:
+                    self.terms[" ".join(words)] = (polarity, float(weight))
+                    self.max_term_words = max(self.max_term_words, len(words))
+
+    def weights_by_polarity(self):
+        """Return ({term: weight} for positive terms, {term: weight} for negative terms)"""
+        positive, negative = {}, {}
+        for term, (polarity, weight) in self.terms.items():
+            (positive if polarity == 'positive' else negative)[term] = weight
+        return positive, negative
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get('positive', {}), config.get('negative', {}))
+
+    def score(self, text):
+        """Return (positive_score, negative_score) summed over every term hit"""
+        words = tokenize(text)
+        terms = self.terms
+        if self.max_term_words == 1:
+            hits = [terms[word] for word in words if word in terms]
+        else:
+            hits = []
+            i = 0
+            while i < len(words):
+                for length in range(min(self.max_term_words, len(words) - i), 0, -1):
+                    match = terms.get(" ".join(words[i:i + length]))
+                    if match is not None:
+                        hits.append(match)
+                        i += length
+                        break
+                else:
+                    i += 1
+
+        positive_score = negative_score = 0.0
+        for polarity, weight in hits:
+            if polarity == 'positive':
+                positive_score += weight
+            else:
+                negative_score += weight
+        return positive_score, negative_score
+
+
+def load_default_lexicon():
+    """Build the lexicon once at import, from DEMO_LEXICON_PATH if set"""
+    path = os.getenv(LEXICON_PATH_ENV)
+    if path:
+        try:
+            return SentimentLexicon.from_file(path)
+        except Exception as e:
+            logger.warning(f"Failed to load demo lexicon from {path}: {e}")
+    return SentimentLexicon(POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS)
+
+
+DEFAULT_LEXICON = load_default_lexicon()
+
+
+# Mock confidence scores returned for each demo sentiment label
+CONFIDENCE_SCORES = {
+    "positive": {"positive": 0.75, "neutral": 0.15, "negative": 0.10},
+    "negative": {"positive": 0.10, "neutral": 0.15, "negative": 0.75},
+    "neutral": {"positive": 0.30, "neutral": 0.50, "negative": 0.20},
+}
+DEFAULT_KEY_PHRASES = ["customer feedback", "service quality"]
+
+
+def demo_key_phrases(text):
+    """Extract simple key phrases (leading word pairs)"""
+    words = text.split()
+    key_phrases = [f"{words[i]} {words[i+1]}" for i in range(len(words)-1) if i < 3]
+    return key_phrases if key_phrases else list(DEFAULT_KEY_PHRASES)
+
+
+def analyze_text_demo(text, lexicon=None):
+    """Demo mode analysis (mock responses)"""
+    # Keyword sentiment scoring over the compiled lexicon
+    positive_score, negative_score = (lexicon or DEFAULT_LEXICON).score(text)
+    
+    if positive_score > negative_score:
+        sentiment = "positive"
+    elif negative_score > positive_score:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+    
+    return {
+        "query": text,
+        "sentiment": {
+            "sentiment": sentiment,
+            "confidence_scores": dict(CONFIDENCE_SCORES[sentiment])
+        },
+        "key_phrases": demo_key_phrases(text),
+        "entities": []
+    }
+
+
+def analyze_series_demo(texts, lexicon=None):
+    """Score a pandas Series of texts with the demo analyzer in columnar form.
+
+    Returns a DataFrame indexed like texts with query, positive_score,
+    negative_score, sentiment, confidence_positive/neutral/negative and
+    key_phrases columns. Labels and scores match analyze_text_demo row for row.
+    """
+    import numpy as np
+    import pandas as pd
+
+    lexicon = lexicon or DEFAULT_LEXICON
+    texts = texts.fillna('').astype(str)
+    if lexicon.max_term_words == 1:
+        positive, negative = _score_words_vectorized(texts, lexicon)
+    else:
+        scores = np.array([lexicon.score(text) for text in texts], dtype=float).reshape(-1, 2)
+        positive, negative = scores[:, 0], scores[:, 1]
+
+    conditions = [positive > negative, negative > positive]
+    frame = pd.DataFrame({
+        "query": texts.to_numpy(),
+        "positive_score": positive,
+        "negative_score": negative,
+        "sentiment": np.select(conditions, ["positive", "negative"], "neutral"),
+    }, index=texts.index)
+    for label in ("positive", "neutral", "negative"):
+        frame[f"confidence_{label}"] = np.select(
+            conditions,
+            [CONFIDENCE_SCORES["positive"][label], CONFIDENCE_SCORES["negative"][label]],
+            CONFIDENCE_SCORES["neutral"][label]
+        )
+    frame["key_phrases"] = _key_phrases_vectorized(texts)
+    return frame
+
+
+def _key_phrases_vectorized(texts):
+    """demo_key_phrases for every text, pairing the leading words of all texts at once"""
+    import numpy as np
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        # The first four words are exact after at most four splits; anything longer stays in a fifth part
+        words = pc.utf8_split_whitespace(
+            pc.utf8_trim_whitespace(pa.array(texts.to_numpy(), type=pa.large_string())), max_splits=4
+        )
+        flat_words = pc.list_flatten(words)
+        rows = pc.list_parent_indices(words).to_numpy()
+        offsets = words.offsets.to_numpy()
+        position = np.arange(len(rows)) - offsets[rows]
+        # A word starts a phrase when it is one of the first three and the next word is in the same text
+        starts = np.flatnonzero((position[:-1] < 3) & (rows[:-1] == rows[1:]))
+        phrases = pc.binary_join_element_wise(flat_words.take(starts), flat_words.take(starts + 1),
+                                              pa.scalar(" ", type=pa.large_string()))
+        counts = np.bincount(rows[starts], minlength=len(texts))
+        phrase_offsets = np.concatenate([[0], np.cumsum(counts)])
+        phrase_lists = pa.LargeListArray.from_arrays(phrase_offsets, phrases).to_pylist()
+    else:
+        # Columns 0-3 hold exact words, like the four leading words above
+        words = texts.str.split(n=4, expand=True).reindex(columns=range(5))
+        pairs = [words[i] + " " + words[i + 1] for i in range(3)]
+        phrase_lists = [[phrase for phrase in row if isinstance(phrase, str)] for row in zip(*pairs)]
+    return [phrases or list(DEFAULT_KEY_PHRASES) for phrases in phrase_lists]
+
+
+def _score_words_vectorized(texts, lexicon):
+    """Sum single-word lexicon weights per text without a Python loop over rows"""
+    import numpy as np
+
+    positive_weights, negative_weights = lexicon.weights_by_polarity()
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        # Split every text in one kernel call, then match all words against the lexicon at once
+        words = pc.split_pattern_regex(pc.utf8_lower(pa.array(texts.to_numpy(), type=pa.large_string())),
+                                       SPLIT_PATTERN_RE2)
+        flat_words = pc.utf8_trim(pc.list_flatten(words), "'")
+        rows = pc.list_parent_indices(words).to_numpy()
+        totals = []
+        for weights in (positive_weights, negative_weights):
+            if not weights:
+                totals.append(np.zeros(len(texts)))
+                continue
+            term_index = pc.index_in(flat_words, value_set=pa.array(list(weights), type=pa.large_string()))
+            hit = term_index.is_valid().to_numpy(zero_copy_only=False)
+            term_weights = np.fromiter(weights.values(), dtype=float, count=len(weights))
+            hit_weights = term_weights[term_index.to_numpy(zero_copy_only=False)[hit].astype(np.int64)]
+            totals.append(np.bincount(rows[hit], weights=hit_weights, minlength=len(texts)).astype(float))
+        return totals[0], totals[1]
+
+    import pandas as pd
+
+    positions = pd.RangeIndex(len(texts))
+    words = pd.Series(texts.to_numpy(), index=positions).map(tokenize).explode()
+    positive = words.map(positive_weights).groupby(level=0).sum().reindex(positions, fill_value=0.0)
+    negative = words.map(negative_weights).groupby(level=0).sum().reindex(positions, fill_value=0.0)
+    return positive.to_numpy(dtype=float), negative.to_numpy(dtype=float)
+
+
+def demo_results_from_frame(frame):
+    """Yield analyze_text_demo-shaped result dicts from an analyze_series_demo frame"""
+    columns = ["query", "sentiment", "confidence_positive", "confidence_neutral", "confidence_negative", "key_phrases"]
+    # Whole-column tolist() is far cheaper than per-row access on Arrow-backed string columns
+    for query, sentiment, positive, neutral, negative, key_phrases in zip(*(frame[c].tolist() for c in columns)):
+        yield {
+            "query": query,
+            "sentiment": {
+                "sentiment": sentiment,
+                "confidence_scores": {"positive": positive, "neutral": neutral, "negative": negative}
+            },
+            "key_phrases": key_phrases,
+            "entities": []
+        }
+
+
+def analyze_texts_vectorized(texts, lexicon=None):
+    """analyze_text_demo results for a list of texts, scored in columnar form in one pass"""
+    import pandas as pd
+
+    return list(demo_results_from_frame(analyze_series_demo(pd.Series(list(texts), dtype=object), lexicon)))
+
+
+def analyze_texts_demo_serial(texts):
+    """Analyze texts one after another in this process"""
+    return [analyze_text_demo(text) for text in texts]
+
+
+def analyze_texts_in_process(texts):
+    """Analyze texts in this process, with the columnar scorer when there are enough of them"""
+    texts = list(texts)
+    if len(texts) >= VECTORIZED_MIN_TEXTS:
+        return analyze_texts_vectorized(texts)
+    return analyze_texts_demo_serial(texts)
+
+
+class ParallelDemoAnalyzer:
+    """Shard demo analysis across a reusable process pool, preserving input order.
+
+    Safe to share between threads: the pool is started once, on first use.
+    """
+
+    def __init__(self, workers=None, min_parallel_texts=PARALLEL_MIN_TEXTS, min_chunk_texts=1):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_parallel_texts = min_parallel_texts
+        self.min_chunk_texts = min_chunk_texts
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def analyze(self, texts):
+        """Return analyze_text_demo results for texts, in input order"""
+        texts = list(texts)
+        if self.workers <= 1 or len(texts) < self.min_parallel_texts:
+            return analyze_texts_in_process(texts)
+
+        # Each worker analyzes whole chunks, so large chunks take the columnar scorer
+        size = max(1, self.min_chunk_texts, math.ceil(len(texts) / (self.workers * CHUNKS_PER_WORKER)))
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        try:
+            return [result for chunk in self._pool().map(analyze_texts_in_process, chunks) for result in chunk]
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Process pool unavailable, analyzing in a single process: {e}")
+            self.close()
+            return analyze_texts_in_process(texts)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def analyze_texts_demo(texts, workers=None, min_parallel_texts=PARALLEL_MIN_TEXTS):
+    """Analyze many texts with the demo analyzer, in parallel for large inputs"""
+    with ParallelDemoAnalyzer(workers, min_parallel_texts) as analyzer:
+        return analyzer.analyze(texts)
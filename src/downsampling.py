@@ -0,0 +1,83 @@
+"""
+Server-side downsampling of long chart series (LTTB and min/max bucketing)
+"""
+
+import numpy as np
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax", "none")
+
+# Rough serialized size of one (int32 x, float32 y) point in Plotly's base64 array encoding, with headroom
+BYTES_PER_POINT = 16
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Preserves the
+    visual shape of a line far better than taking every k-th point.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    kept = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        areas = np.abs(
+            (x[kept] - avg_x) * (y[start:end] - y[kept]) - (x[kept] - x[start:end]) * (avg_y - y[kept])
+        )
+        kept = start + int(areas.argmax())
+        indices[bucket + 1] = kept
+    return indices
+
+
+def minmax_indices(y, buckets):
+    """Indices of the first, last, minimum and maximum point of each of buckets equal slices"""
+    n = len(y)
+    if buckets * 4 >= n or buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    keep = [edges[:-1], edges[1:] - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        chunk = y[start:end]
+        keep.append([start + int(chunk.argmin()), start + int(chunk.argmax())])
+    return np.unique(np.concatenate([np.asarray(part, dtype=np.int64).ravel() for part in keep]))
+
+
+def downsample_indices(x, y, max_points, method="lttb"):
+    """Indices of at most max_points points to plot (all points if the series already fits).
+
+    Method "none" adds no width-based reduction, but a series over
+    max_points (the payload cap) still falls back to min/max bucketing.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method {method!r}; expected one of {', '.join(DOWNSAMPLING_METHODS)}")
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+    if method in ("minmax", "none"):
+        return minmax_indices(y, max(max_points // 4, 1))
+    return lttb_indices(x, y, max_points)
+
+
+def point_budget(width_px, method="lttb", max_payload_bytes=None):
+    """Points worth sending for a chart width_px wide, capped so the payload stays under max_payload_bytes.
+
+    LTTB keeps about one point per pixel column; min/max bucketing keeps up
+    to four per bucket, so it gets a bucket per pixel column. With method
+    "none" only the payload cap applies (None means no limit).
+    """
+    points = {"lttb": width_px, "minmax": 4 * width_px}.get(method)
+    if max_payload_bytes:
+        payload_points = max(max_payload_bytes // BYTES_PER_POINT, 3)
+        points = payload_points if points is None else min(points, payload_points)
+    return points
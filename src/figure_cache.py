@@ -0,0 +1,64 @@
+"""
+Process-wide LRU cache of built Plotly figures
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 64
+
+# Cached stand-in for charts that had nothing to plot
+_EMPTY = object()
+
+
+class FigureCache:
+    """LRU of figures keyed by (chart, history fingerprint, chart settings).
+
+    Figures are shared between reruns and sessions, so callers must treat
+    them as read-only; Streamlit only serializes them.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, build):
+        """Return the figure cached under key, building and storing it on a miss"""
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return None if figure is _EMPTY else figure
+            self.misses += 1
+
+        # Built outside the lock so one slow chart does not block other sessions
+        figure = build()
+        with self._lock:
+            self._entries[key] = _EMPTY if figure is None else figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return hit/miss counters for display"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
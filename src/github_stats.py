@@ -0,0 +1,133 @@
+"""
+Process-wide GitHub repository statistics with background refresh
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com/repos/{repo}"
+DEFAULT_TTL_SECONDS = 3600
+FAILURE_RETRY_SECONDS = 300
+REQUEST_TIMEOUT_SECONDS = 5
+
+
+def default_stats(repo):
+    """Placeholder stats shown until the first successful fetch"""
+    return {
+        "stars": 0,
+        "forks": 0,
+        "watchers": 0,
+        "open_issues": 0,
+        "url": f"https://github.com/{repo}",
+        "description": "Natural Language to Governed Insights"
+    }
+
+
+class GitHubStatsCache:
+    """Stats shared by every session; refreshed in the background with conditional requests"""
+
+    def __init__(self, repo, ttl_seconds=DEFAULT_TTL_SECONDS, session=None):
+        self.repo = repo
+        self.ttl_seconds = ttl_seconds
+        self.stats = default_stats(repo)
+        self.fetched_at = None
+        self.etag = None
+        self.last_attempt_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        self.session = session
+
+    def _get_session(self):
+        """Build the pooled HTTP session on first use (keeps requests off the startup path)"""
+        if self.session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            session.headers.update({
+                "Accept": "application/vnd.github.v3+json",
+                "User-Agent": "Natural-Language-to-Governed-Insights-App"
+            })
+            token = os.getenv("GITHUB_TOKEN") or os.getenv("HF_GITHUB_TOKEN")
+            if token:
+                session.headers["Authorization"] = f"Bearer {token}"
+            self.session = session
+        return self.session
+
+    def get(self):
+        """Return the latest stats without blocking, scheduling a refresh if stale"""
+        if self.is_stale():
+            self.refresh_async()
+        return dict(self.stats)
+
+    def is_stale(self):
+        now = time.time()
+        # Back off after a failed attempt instead of retrying on every rerun
+        if self.last_attempt_at is not None and now - self.last_attempt_at < FAILURE_RETRY_SECONDS:
+            if self.fetched_at is None or self.fetched_at < self.last_attempt_at:
+                return False
+        return self.fetched_at is None or now - self.fetched_at >= self.ttl_seconds
+
+    def refresh_async(self):
+        """Start a background refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="github-stats-refresh", daemon=True).start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self):
+        """Fetch stats now, sending If-None-Match so unchanged data costs no quota"""
+        import requests
+
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        self.last_attempt_at = time.time()
+        try:
+            response = self._get_session().get(
+                GITHUB_API_URL.format(repo=self.repo),
+                headers=headers,
+                timeout=REQUEST_TIMEOUT_SECONDS
+            )
+            logger.info(f"GitHub API response status: {response.status_code}")
+
+            if response.status_code == 304:
+                self.fetched_at = time.time()
+                return True
+            if response.status_code == 200:
+                data = response.json()
+                self.stats = {
+                    "stars": int(data.get("stargazers_count", 0)),
+                    "forks": int(data.get("forks_count", 0)),
+                    "watchers": int(data.get("watchers_count", 0)),
+                    "open_issues": int(data.get("open_issues_count", 0)),
+                    "url": str(data.get("html_url", "")),
+                    "description": str(data.get("description", ""))
+                }
+                self.etag = response.headers.get("ETag")
+                self.fetched_at = time.time()
+                logger.info(f"Fetched GitHub stats: {self.stats}")
+                return True
+
+            logger.warning(f"GitHub API error: {response.status_code} - {response.text}")
+            if response.status_code == 403:
+                logger.warning("GitHub API rate limit or auth required. Set GITHUB_TOKEN or HF_GITHUB_TOKEN.")
+        except requests.exceptions.Timeout:
+            logger.warning("GitHub API request timeout")
+        except requests.exceptions.ConnectionError:
+            logger.warning("GitHub API connection error")
+        except Exception as e:
+            logger.error(f"Failed to fetch GitHub stats: {e}", exc_info=True)
+        return False
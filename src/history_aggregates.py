@@ -0,0 +1,77 @@
+"""
+Running aggregates over insight history for the History tab
+"""
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from src.insight_fields import normalize_sentiment_value, extract_topics, to_float, timestamp_date
+
+CONFIDENCE_BINS = 10
+
+
+class HistoryAggregates:
+    """Counters and buckets updated once per insight so charts never rescan history"""
+
+    def __init__(self, history=None):
+        self.total = 0
+        self.sentiment_counts = Counter()
+        self.topic_counts = Counter()
+        self.confidence_sum = 0.0
+        self.confidence_count = 0
+        self.confidence_bins = [0] * CONFIDENCE_BINS
+        self.daily_sentiments = defaultdict(Counter)
+        for insight in history or []:
+            self.add(insight)
+
+    def add(self, insight):
+        """Fold a single new insight into the aggregates"""
+        self.total += 1
+        sentiment = normalize_sentiment_value(insight.get('sentiment'))
+        self.sentiment_counts[sentiment] += 1
+        self.topic_counts.update(extract_topics(insight))
+
+        confidence = to_float(insight.get('confidence'))
+        if confidence is not None:
+            self.confidence_sum += confidence
+            self.confidence_count += 1
+            bin_index = min(max(int(confidence * CONFIDENCE_BINS), 0), CONFIDENCE_BINS - 1)
+            self.confidence_bins[bin_index] += 1
+
+        day = timestamp_date(insight.get('timestamp'))
+        if day is not None:
+            self.daily_sentiments[day][sentiment] += 1
+
+    @property
+    def avg_confidence(self):
+        return self.confidence_sum / self.confidence_count if self.confidence_count else 0
+
+    @property
+    def unique_topics(self):
+        return len(self.topic_counts)
+
+    def confidence_bin_edges(self):
+        """Return (start, end) pairs for each confidence histogram bin"""
+        width = 1.0 / CONFIDENCE_BINS
+        return [(i * width, (i + 1) * width) for i in range(CONFIDENCE_BINS)]
+
+    def timeline_rows(self, max_periods=None):
+        """Return sentiment counts per day as rows sorted by date.
+
+        If the days span more than max_periods, consecutive days are summed
+        into equal periods, each labelled with its first day.
+        """
+        daily = self.daily_sentiments
+        if max_periods and daily:
+            first = min(daily)
+            period_days = -(-((max(daily) - first).days + 1) // max_periods)
+            if period_days > 1:
+                daily = defaultdict(Counter)
+                for day, counts in self.daily_sentiments.items():
+                    daily[first + timedelta(days=(day - first).days // period_days * period_days)].update(counts)
+
+        rows = []
+        for day in sorted(daily):
+            for sentiment, count in sorted(daily[day].items()):
+                rows.append({'timestamp': day, 'sentiment_normalized': sentiment, 'count': count})
+        return rows
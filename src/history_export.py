@@ -0,0 +1,154 @@
+"""
+Chunked, on-demand export of insight history to CSV, JSON, JSON Lines and Parquet
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+from src.insight_fields import normalize_sentiment_value, extract_topics
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+def iter_history_chunks(history, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield lists of at most chunk_size insight dicts, stopping at the length seen on entry"""
+    iterator = islice(history, len(history))
+    while True:
+        # Row views from a columnar store are materialized one chunk at a time
+        chunk = [dict(insight) for insight in islice(iterator, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+class JsonlInsightWriter:
+    """Write insights one JSON object per line"""
+
+    def __init__(self, target):
+        self._owns_file = isinstance(target, str)
+        self._file = open(target, "w", encoding="utf-8") if self._owns_file else target
+
+    def write(self, insights):
+        for insight in insights:
+            self._file.write(json.dumps(insight, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+
+class ParquetInsightWriter:
+    """Write insights as Parquet row groups, one per chunk"""
+
+    def __init__(self, target):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        self._pa = pa
+        self.schema = pa.schema([
+            ("timestamp", pa.string()),
+            ("query", pa.string()),
+            ("sentiment", pa.string()),
+            ("confidence", pa.float64()),
+            ("key_topics", pa.list_(pa.string())),
+            ("summary", pa.string()),
+            ("recommendations", pa.list_(pa.string())),
+            ("insight", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(target, self.schema, compression="zstd")
+
+    def write(self, insights):
+        if not insights:
+            return
+        columns = {name: [] for name in self.schema.names}
+        for insight in insights:
+            confidence = insight.get("confidence")
+            columns["timestamp"].append(str(insight.get("timestamp", "")))
+            columns["query"].append(str(insight.get("query", "")))
+            columns["sentiment"].append(normalize_sentiment_value(insight.get("sentiment")))
+            columns["confidence"].append(float(confidence) if isinstance(confidence, (int, float)) else None)
+            columns["key_topics"].append(extract_topics(insight))
+            columns["summary"].append(str(insight.get("summary", "")))
+            columns["recommendations"].append([str(r) for r in insight.get("recommendations") or []])
+            columns["insight"].append(json.dumps(insight, ensure_ascii=False))
+        self._writer.write_table(self._pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path):
+    """Pick an insight writer from the output file extension"""
+    if path.endswith(".parquet"):
+        return ParquetInsightWriter(path)
+    return JsonlInsightWriter(path)
+
+
+def _text_sink(buffer):
+    return io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True)
+
+
+def _contents(buffer, text_sink=None):
+    """Return a finished export as bytes (what st.download_button accepts from a callable)"""
+    if text_sink is not None:
+        text_sink.detach()
+    return buffer.getvalue()
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _column_names(history):
+    """Ordered union of the keys of history's rows, as a DataFrame export would produce"""
+    if hasattr(history, "column_names"):
+        # A columnar store knows its columns without materializing any rows
+        return history.column_names(len(history))
+    fieldnames = {}
+    for insight in islice(history, len(history)):
+        fieldnames.update(dict.fromkeys(insight))
+    return list(fieldnames)
+
+
+def export_csv(history, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write history as CSV in chunks; returns the file contents as bytes"""
+    fieldnames = _column_names(history)
+    buffer = io.BytesIO()
+    sink = _text_sink(buffer)
+    writer = csv.DictWriter(sink, fieldnames=fieldnames, restval="")
+    writer.writeheader()
+    for chunk in iter_history_chunks(history, chunk_size):
+        writer.writerows({key: _csv_value(value) for key, value in insight.items()} for insight in chunk)
+    return _contents(buffer, sink)
+
+
+def export_json(history, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write history as a JSON array in chunks; returns the file contents as bytes"""
+    buffer = io.BytesIO()
+    sink = _text_sink(buffer)
+    sink.write("[")
+    first = True
+    for chunk in iter_history_chunks(history, chunk_size):
+        for insight in chunk:
+            sink.write("\n  " if first else ",\n  ")
+            sink.write(json.dumps(insight, ensure_ascii=False))
+            first = False
+    sink.write("\n]\n")
+    return _contents(buffer, sink)
+
+
+def export_parquet(history, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write history as zstd-compressed Parquet, one row group per chunk; returns the file contents as bytes"""
+    buffer = io.BytesIO()
+    writer = ParquetInsightWriter(buffer)
+    for chunk in iter_history_chunks(history, chunk_size):
+        writer.write(chunk)
+    writer.close()
+    return _contents(buffer)
@@ -0,0 +1,72 @@
+"""
+Positional index over insight history for filtering and pagination
+"""
+
+import bisect
+from collections import defaultdict
+
+from src.insight_fields import normalize_sentiment_value, timestamp_date
+from src.topic_index import TopicIndex
+
+
+class HistoryIndex:
+    """Posting lists from sentiment, topic and day to history positions, kept in append order"""
+
+    def __init__(self, history=None):
+        self.size = 0
+        self.by_sentiment = defaultdict(list)
+        self.topics = TopicIndex()
+        self.by_day = defaultdict(list)
+        self.days = []
+        for insight in history or []:
+            self.add(insight)
+
+    def add(self, insight):
+        """Index the insight stored at the next history position"""
+        position = self.size
+        self.size += 1
+        self.by_sentiment[normalize_sentiment_value(insight.get('sentiment'))].append(position)
+        self.topics.add(insight)
+        day = timestamp_date(insight.get('timestamp'))
+        if day is not None:
+            if day not in self.by_day:
+                bisect.insort(self.days, day)
+            self.by_day[day].append(position)
+
+    def query(self, sentiments=None, topic=None, start_date=None, end_date=None, topic_search=None):
+        """Return matching positions newest first, or None when no filter is active"""
+        candidates = []
+        if sentiments:
+            candidates.append(set().union(*(self.by_sentiment.get(s, []) for s in sentiments)))
+        if topic:
+            candidates.append(set(self.topics.postings.get(topic, [])))
+        searched = None
+        if topic_search:
+            searched = self.topics.search_positions(topic_search)
+            candidates.append(searched)
+        if start_date is not None or end_date is not None:
+            lo = bisect.bisect_left(self.days, start_date) if start_date is not None else 0
+            hi = bisect.bisect_right(self.days, end_date) if end_date is not None else len(self.days)
+            candidates.append(set().union(*(self.by_day[day] for day in self.days[lo:hi])))
+        if not candidates:
+            return None
+
+        if len(candidates) == 1 and candidates[0] is searched:
+            # A search alone is already sorted newest first
+            return searched
+
+        # Intersect starting from the smallest posting set
+        candidates.sort(key=len)
+        matches = set(candidates[0]).intersection(*candidates[1:])
+        return sorted(matches, reverse=True)
+
+    def page(self, page, page_size, matches=None):
+        """Return (positions, total) for one page, newest first, without scanning other pages"""
+        total = self.size if matches is None else len(matches)
+        start = page * page_size
+        end = min(start + page_size, total)
+        if start >= total:
+            return [], total
+        if matches is None:
+            return [self.size - 1 - i for i in range(start, end)], total
+        return matches[start:end], total
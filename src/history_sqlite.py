@@ -0,0 +1,228 @@
+"""
+SQLite (WAL) history backend shared safely by concurrent sessions and worker processes
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+
+from src.insight_fields import normalize_sentiment_value, to_float
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS insights ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "timestamp TEXT, "
+    "sentiment TEXT NOT NULL, "
+    "confidence REAL, "
+    "user_id TEXT, "
+    "payload TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_insights_timestamp ON insights(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_insights_sentiment ON insights(sentiment)",
+    "CREATE INDEX IF NOT EXISTS idx_insights_user ON insights(user_id, id)",
+)
+
+INSERT_SQL = "INSERT INTO insights (timestamp, sentiment, confidence, user_id, payload) VALUES (?, ?, ?, ?, ?)"
+
+# user_id filter meaning "every partition"; None is the shared default partition (including imported rows).
+# Store methods take user_id as a required keyword so no caller reaches other users' rows by omission.
+ALL_USERS = object()
+
+
+def _user_clause(user_id):
+    """WHERE clause and parameters restricting a query to one partition (served by idx_insights_user)"""
+    if user_id is ALL_USERS:
+        return None, []
+    if user_id is None:
+        return "user_id IS NULL", []
+    return "user_id = ?", [user_id]
+
+
+def _where(*clauses):
+    clauses = [clause for clause in clauses if clause]
+    return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def _row(insight, user_id):
+    timestamp = insight.get("timestamp")
+    return (
+        timestamp if isinstance(timestamp, str) else None,
+        normalize_sentiment_value(insight.get("sentiment")),
+        to_float(insight.get("confidence")),
+        user_id,
+        json.dumps(insight, ensure_ascii=False),
+    )
+
+
+class SQLiteHistoryStore:
+    """History in a SQLite database in WAL mode: readers never block the single writer,
+    and concurrent writers wait on the busy timeout instead of clobbering each other.
+
+    Row methods take a required user_id keyword; sessions should hold a
+    partition(user_id) instead, which supplies it on every call.
+    """
+
+    def __init__(self, path, import_from=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            for statement in SCHEMA:
+                self._db.execute(statement)
+        if import_from is not None:
+            self._import(import_from)
+
+    def append(self, insight, *, user_id):
+        """Insert a single insight into user_id's partition"""
+        self.append_many([insight], user_id=user_id)
+
+    def append_many(self, insights, *, user_id):
+        """Insert insights into user_id's partition in one transaction"""
+        if user_id is ALL_USERS:
+            raise ValueError("Insights must be appended to a single partition")
+        rows = [_row(insight, user_id) for insight in insights]
+        if not rows:
+            return
+        with self._lock, self._db:
+            self._db.executemany(INSERT_SQL, rows)
+
+    def clear(self, *, user_id):
+        """Delete one user's partition (or every partition, with ALL_USERS)"""
+        clause, params = _user_clause(user_id)
+        with self._lock, self._db:
+            self._db.execute(f"DELETE FROM insights{_where(clause)}", params)
+
+    def load(self, *, user_id):
+        """Return one user's insights (or every partition's, with ALL_USERS) in insertion order"""
+        clause, params = _user_clause(user_id)
+        with self._lock:
+            rows = self._db.execute(f"SELECT payload FROM insights{_where(clause)} ORDER BY id", params).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def partition(self, user_id):
+        """View of this store restricted to user_id's rows (None is the shared default partition)"""
+        return SQLiteHistoryPartition(self, user_id)
+
+    def compact(self):
+        """Fold the WAL back into the database file and reclaim free pages"""
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._db.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # Aggregates computed by SQLite rather than by loading rows into Python
+
+    def count(self, *, user_id):
+        clause, params = _user_clause(user_id)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM insights{_where(clause)}", params).fetchone()[0]
+
+    def sentiment_counts(self, *, user_id):
+        """Return {sentiment: count}"""
+        clause, params = _user_clause(user_id)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT sentiment, COUNT(*) FROM insights{_where(clause)} GROUP BY sentiment", params
+            ).fetchall()
+        return dict(rows)
+
+    def avg_confidence(self, *, user_id):
+        """Average of the numeric confidences, or 0 when there are none"""
+        clause, params = _user_clause(user_id)
+        with self._lock:
+            value = self._db.execute(f"SELECT AVG(confidence) FROM insights{_where(clause)}", params).fetchone()[0]
+        return value or 0
+
+    def daily_sentiment_counts(self, start_date=None, end_date=None, *, user_id):
+        """Return rows of {'timestamp': 'YYYY-MM-DD', 'sentiment_normalized', 'count'} sorted by day"""
+        clause, params = _user_clause(user_id)
+        clauses = [clause, "timestamp IS NOT NULL"]
+        if start_date is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            # Any timestamp on end_date sorts before the next character after the date
+            clauses.append("timestamp < ?")
+            params.append(end_date.isoformat() + "~")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT substr(timestamp, 1, 10) AS day, sentiment, COUNT(*) FROM insights"
+                f"{_where(*clauses)} GROUP BY day, sentiment ORDER BY day, sentiment",
+                params
+            ).fetchall()
+        return [{'timestamp': day, 'sentiment_normalized': sentiment, 'count': count}
+                for day, sentiment, count in rows]
+
+    def _import(self, source):
+        """Copy records from another backend once, when this database is still empty"""
+        if self.count(user_id=ALL_USERS):
+            return
+        try:
+            history = source.load()
+        except Exception as e:
+            logger.warning(f"Failed to import history into {self.path}: {e}")
+            return
+        if not history:
+            return
+        rows = [_row(insight, None) for insight in history]
+        with self._lock:
+            # Re-check under a write lock so concurrent processes import only once
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                imported = self._db.execute("SELECT COUNT(*) FROM insights").fetchone()[0] == 0
+                if imported:
+                    self._db.executemany(INSERT_SQL, rows)
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+        if imported:
+            logger.info(f"Imported {len(rows)} items into {self.path}")
+
+
+class SQLiteHistoryPartition:
+    """One user's partition of a SQLiteHistoryStore.
+
+    Every read, write and delete carries the partition's user_id, so a
+    session holding a partition cannot see or clear other users' rows.
+    """
+
+    def __init__(self, store, user_id):
+        self.store = store
+        self.user_id = user_id
+
+    def append(self, insight):
+        self.store.append(insight, user_id=self.user_id)
+
+    def append_many(self, insights):
+        self.store.append_many(insights, user_id=self.user_id)
+
+    def clear(self):
+        self.store.clear(user_id=self.user_id)
+
+    def load(self):
+        return self.store.load(user_id=self.user_id)
+
+    def compact(self):
+        self.store.compact()
+
+    def count(self):
+        return self.store.count(user_id=self.user_id)
+
+    def sentiment_counts(self):
+        return self.store.sentiment_counts(user_id=self.user_id)
+
+    def avg_confidence(self):
+        return self.store.avg_confidence(user_id=self.user_id)
+
+    def daily_sentiment_counts(self, start_date=None, end_date=None):
+        return self.store.daily_sentiment_counts(start_date, end_date, user_id=self.user_id)
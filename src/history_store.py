@@ -0,0 +1,162 @@
+"""
+Append-only persistence for insight history
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Marker record written by clear(); everything before it is discarded on load
+TOMBSTONE = {"_op": "clear"}
+
+# Compact once dead lines (cleared or torn records) outnumber live ones by this much
+COMPACT_MIN_DEAD_LINES = 1000
+
+HISTORY_BACKENDS = ("jsonl", "sqlite")
+
+
+def partition_path(path, user_id):
+    """Log file holding user_id's history; the shared default partition (None) keeps path itself"""
+    if user_id is None:
+        return path
+    root, ext = os.path.splitext(path)
+    # Hashed so any identity (an email, a header value) makes a safe file name
+    digest = hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:16]
+    return f"{root}.{digest}{ext}"
+
+
+class HistoryLog:
+    """JSON Lines history log: one insight per line, appended on every query"""
+
+    def __init__(self, path, legacy_path=None, compact_min_dead_lines=COMPACT_MIN_DEAD_LINES):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.compact_min_dead_lines = compact_min_dead_lines
+        self._lock = threading.Lock()
+        self._partitions = {}
+
+    def partition(self, user_id):
+        """Log holding only user_id's history, in its own file so loading it never reads other users' records"""
+        if user_id is None:
+            return self
+        with self._lock:
+            log = self._partitions.get(user_id)
+            if log is None:
+                log = self._partitions[user_id] = HistoryLog(
+                    partition_path(self.path, user_id),
+                    compact_min_dead_lines=self.compact_min_dead_lines
+                )
+            return log
+
+    def append(self, insight):
+        """Append a single insight as one JSON line"""
+        self._write_records([insight])
+
+    def append_many(self, insights):
+        """Append several insights with a single write and fsync"""
+        if insights:
+            self._write_records(insights)
+
+    def clear(self):
+        """Discard all history by appending a tombstone record"""
+        self._write_records([TOMBSTONE])
+
+    def load(self):
+        """Stream the log back into a list of insights, skipping torn or cleared records"""
+        with self._lock:
+            self._migrate_legacy()
+            history, dead_lines = self._read()
+            if dead_lines >= self.compact_min_dead_lines and dead_lines > len(history):
+                self._compact(history)
+            return history
+
+    def compact(self):
+        """Rewrite the log so it holds only live records"""
+        with self._lock:
+            self._migrate_legacy()
+            history, _ = self._read()
+            self._compact(history)
+
+    def _read(self):
+        history = []
+        dead_lines = 0
+        if not os.path.exists(self.path):
+            return history, dead_lines
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one partial line behind
+                    logger.warning(f"Skipping unreadable history record at line {line_number}")
+                    dead_lines += 1
+                    continue
+                if record == TOMBSTONE:
+                    dead_lines += len(history) + 1
+                    history = []
+                else:
+                    history.append(record)
+        return history, dead_lines
+
+    def _write_records(self, records):
+        line = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        with self._lock:
+            self._migrate_legacy()
+            with open(self.path, 'ab+') as f:
+                # Terminate a partial line left behind by an interrupted write
+                end = f.seek(0, os.SEEK_END)
+                if end > 0:
+                    f.seek(end - 1)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _compact(self, history):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in history:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        logger.info(f"Compacted history log to {len(history)} records")
+
+    def _migrate_legacy(self):
+        """Convert a legacy JSON array history file into the log format once"""
+        if not self.legacy_path or os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read legacy history file: {e}")
+            return
+        if isinstance(history, list):
+            self._compact(history)
+            logger.info(f"Migrated {len(history)} items from {self.legacy_path}")
+
+
+def open_history_backend(backend, path, legacy_path=None, db_path=None):
+    """Return the history backend named by backend ("jsonl" or "sqlite").
+
+    Both expose append, append_many, clear, load and compact, plus
+    partition(user_id) returning the same interface restricted to one user
+    (None is the shared default partition). The SQLite backend imports the
+    JSON Lines log at path the first time it is opened.
+    """
+    if backend == "sqlite":
+        from src.history_sqlite import SQLiteHistoryStore
+
+        return SQLiteHistoryStore(db_path, import_from=HistoryLog(path, legacy_path=legacy_path))
+    if backend != "jsonl":
+        raise ValueError(f"Unknown history backend {backend!r}; expected one of {', '.join(HISTORY_BACKENDS)}")
+    return HistoryLog(path, legacy_path=legacy_path)
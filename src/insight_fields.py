@@ -0,0 +1,51 @@
+"""
+Helpers for reading fields from stored insight records
+"""
+
+import math
+from collections.abc import Mapping
+from datetime import datetime
+
+
+def normalize_sentiment_value(value):
+    """Normalize sentiment field to a lowercase string label."""
+    try:
+        if isinstance(value, dict):
+            return str(value.get('sentiment', 'unknown')).lower()
+        if value is None:
+            return 'unknown'
+        return str(value).lower()
+    except Exception:
+        return 'unknown'
+
+
+def extract_topics(insight):
+    """Return a safe list of topics from an insight entry."""
+    topics = insight.get('key_topics', []) if isinstance(insight, Mapping) else []
+    if topics is None:
+        return []
+    if isinstance(topics, list):
+        return [str(t) for t in topics if t is not None]
+    # Handle unexpected scalar by wrapping into list
+    return [str(topics)]
+
+
+def to_float(value):
+    """Return value as a finite float, or None if it is not numeric"""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def timestamp_date(value):
+    """Return the calendar date of an ISO timestamp, or None if unparseable"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
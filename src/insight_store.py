@@ -0,0 +1,402 @@
+"""
+Columnar in-memory store for insight history
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+SENTIMENT_SCORE_LABELS = ("positive", "neutral", "negative")
+INITIAL_CAPACITY = 256
+
+# Fields held in typed columns; bit i of a row's presence mask marks FIELDS[i]
+FIELDS = ("timestamp", "query", "sentiment", "confidence", "key_topics", "summary", "recommendations", "cluster_id")
+FIELD_BITS = {name: 1 << i for i, name in enumerate(FIELDS)}
+
+
+class _GrowableArray:
+    """NumPy array with amortized O(1) append; view() is a zero-copy slice"""
+
+    def __init__(self, dtype, capacity=INITIAL_CAPACITY):
+        self._data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self._data):
+            grown = np.empty(len(self._data) * 2, dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+        self._data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def view(self):
+        return self._data[:self.size]
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+
+class _InternTable:
+    """Maps repeated strings to small integer IDs"""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+
+class _StringListColumn:
+    """Per-row lists of interned strings, stored as flat IDs plus row offsets"""
+
+    def __init__(self, table):
+        self.table = table
+        self.ids = _GrowableArray(np.int32)
+        self.offsets = _GrowableArray(np.int64)
+        self.offsets.append(0)
+
+    def append(self, values):
+        self.ids.extend(self.table.intern(value) for value in values)
+        self.offsets.append(self.ids.size)
+
+    def row_ids(self, position):
+        offsets = self.offsets.view()
+        return self.ids.view()[offsets[position]:offsets[position + 1]]
+
+    def row(self, position):
+        values = self.table.values
+        return [values[i] for i in self.row_ids(position)]
+
+    @property
+    def nbytes(self):
+        return self.ids.nbytes + self.offsets.nbytes
+
+
+def _is_float(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+class InsightStore:
+    """Insight history held in typed columns instead of a list of nested dicts.
+
+    Sentiment labels are int8 codes, confidences are float32, topics and
+    recommendations are interned IDs with offset arrays, near-duplicate
+    cluster IDs are interned, and timestamps are int64 microseconds since
+    the epoch. Indexing returns a read-only,
+    dict-compatible row view. Anything that cannot be encoded exactly (extra
+    keys, unexpected types, timezone-aware timestamps) is kept per row in a
+    sparse extras dict so rows always read back as they were appended;
+    confidences read back at float32 precision.
+    """
+
+    def __init__(self, history=None):
+        self.sentiment_labels = []
+        self._sentiment_codes = {}
+        self._presence = _GrowableArray(np.uint8)
+        self._timestamps = _GrowableArray(np.int64)
+        self._sentiments = _GrowableArray(np.int8)
+        self._scores = _GrowableArray(np.float32)
+        self._confidence = _GrowableArray(np.float32)
+        self.topics = _InternTable()
+        self._key_topics = _StringListColumn(self.topics)
+        self._recommendations = _StringListColumn(_InternTable())
+        self.clusters = _InternTable()
+        self._cluster_ids = _GrowableArray(np.int32)
+        self._queries = []
+        self._summaries = []
+        self._extras = {}
+        self._digests = {}
+        self._fingerprinted_rows = 0
+        self._fingerprinted_values = {}
+        for insight in history or []:
+            self.append(insight)
+
+    def __len__(self):
+        return self._presence.size
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("insight position out of range")
+        return InsightRow(self, position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield InsightRow(self, position)
+
+    def __reversed__(self):
+        for position in range(len(self) - 1, -1, -1):
+            yield InsightRow(self, position)
+
+    def append(self, insight):
+        """Encode one insight dict into the columns and return its position"""
+        position = len(self)
+        presence = 0
+        extras = {}
+
+        timestamp = insight.get("timestamp")
+        encoded_timestamp = self._encode_timestamp(timestamp)
+        if encoded_timestamp != MISSING_TIMESTAMP:
+            presence |= FIELD_BITS["timestamp"]
+        elif "timestamp" in insight:
+            extras["timestamp"] = timestamp
+        self._timestamps.append(encoded_timestamp)
+
+        query = insight.get("query")
+        if isinstance(query, str):
+            presence |= FIELD_BITS["query"]
+        elif "query" in insight:
+            extras["query"] = query
+        self._queries.append(query if isinstance(query, str) else None)
+
+        sentiment = insight.get("sentiment")
+        encoded_sentiment = self._encode_sentiment(sentiment)
+        if encoded_sentiment is not None:
+            presence |= FIELD_BITS["sentiment"]
+            code, scores = encoded_sentiment
+        else:
+            if "sentiment" in insight:
+                extras["sentiment"] = sentiment
+            code, scores = -1, (np.nan, np.nan, np.nan)
+        self._sentiments.append(code)
+        self._scores.extend(scores)
+
+        confidence = insight.get("confidence")
+        if _is_float(confidence):
+            presence |= FIELD_BITS["confidence"]
+            self._confidence.append(confidence)
+        else:
+            if "confidence" in insight:
+                extras["confidence"] = confidence
+            self._confidence.append(np.nan)
+
+        for name, column in (("key_topics", self._key_topics), ("recommendations", self._recommendations)):
+            values = insight.get(name)
+            if _is_string_list(values):
+                presence |= FIELD_BITS[name]
+                column.append(values)
+            else:
+                if name in insight:
+                    extras[name] = values
+                column.append([])
+
+        summary = insight.get("summary")
+        if isinstance(summary, str):
+            presence |= FIELD_BITS["summary"]
+        elif "summary" in insight:
+            extras["summary"] = summary
+        self._summaries.append(summary if isinstance(summary, str) else None)
+
+        cluster = insight.get("cluster_id")
+        if isinstance(cluster, str):
+            presence |= FIELD_BITS["cluster_id"]
+            self._cluster_ids.append(self.clusters.intern(cluster))
+        else:
+            if "cluster_id" in insight:
+                extras["cluster_id"] = cluster
+            self._cluster_ids.append(-1)
+
+        for key, value in insight.items():
+            if key not in FIELD_BITS:
+                extras[key] = value
+        if extras:
+            self._extras[position] = extras
+        self._presence.append(presence)
+        return position
+
+    def _encode_timestamp(self, value):
+        if not isinstance(value, str):
+            return MISSING_TIMESTAMP
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return MISSING_TIMESTAMP
+        if parsed.tzinfo is not None or parsed.isoformat() != value:
+            return MISSING_TIMESTAMP
+        return (parsed - EPOCH) // timedelta(microseconds=1)
+
+    def _encode_sentiment(self, value):
+        """Return (code, scores) for a standard sentiment dict, or None if it must stay raw"""
+        if not isinstance(value, dict) or set(value) != {"sentiment", "confidence_scores"}:
+            return None
+        label, scores = value["sentiment"], value["confidence_scores"]
+        if not isinstance(label, str) or not isinstance(scores, dict) or set(scores) != set(SENTIMENT_SCORE_LABELS):
+            return None
+        values = tuple(scores[name] for name in SENTIMENT_SCORE_LABELS)
+        if not all(_is_float(score) for score in values):
+            return None
+        code = self._sentiment_codes.get(label)
+        if code is None:
+            if len(self.sentiment_labels) >= np.iinfo(np.int8).max:
+                return None
+            code = self._sentiment_codes[label] = len(self.sentiment_labels)
+            self.sentiment_labels.append(label)
+        return code, values
+
+    # Column reads (zero-copy NumPy views over the first len(self) rows)
+
+    def sentiment_codes(self):
+        return self._sentiments.view()
+
+    def confidence_column(self):
+        return self._confidence.view()
+
+    def cluster_id_column(self):
+        """Interned cluster IDs (-1 where an insight has none); names are in self.clusters.values"""
+        return self._cluster_ids.view()
+
+    def timestamp_column(self):
+        return self._timestamps.view()
+
+    def topic_id_column(self):
+        """Return (flat topic IDs, row offsets) for all rows"""
+        return self._key_topics.ids.view(), self._key_topics.offsets.view()
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held by the typed columns (excluding query/summary text)"""
+        return sum(column.nbytes for column in (
+            self._presence, self._timestamps, self._sentiments, self._scores,
+            self._confidence, self._cluster_ids, self._key_topics, self._recommendations
+        ))
+
+    def fingerprint(self):
+        """Content hash of every row; stores holding equal rows agree however the rows were appended.
+
+        Each column feeds its own streaming hash and only rows added since the
+        last call are hashed, so repeated calls are cheap.
+        """
+        start, end = self._fingerprinted_rows, len(self)
+        if start < end or not self._digests:
+            self._hash_rows(start, end)
+            self._fingerprinted_rows = end
+        combined = hashlib.blake2b(digest_size=16)
+        for name in sorted(self._digests):
+            combined.update(self._digests[name].digest())
+        return combined.hexdigest()
+
+    def _feed(self, name, data):
+        digest = self._digests.get(name)
+        if digest is None:
+            digest = self._digests[name] = hashlib.blake2b(digest_size=16)
+        digest.update(data)
+
+    def _hash_rows(self, start, end):
+        for name, column in (("presence", self._presence), ("timestamps", self._timestamps),
+                             ("sentiments", self._sentiments), ("confidence", self._confidence),
+                             ("cluster_ids", self._cluster_ids)):
+            self._feed(name, column.view()[start:end].tobytes())
+        self._feed("scores", self._scores.view()[3 * start:3 * end].tobytes())
+        for name, column in (("key_topics", self._key_topics), ("recommendations", self._recommendations)):
+            offsets = column.offsets.view()
+            self._feed(name, column.ids.view()[offsets[start]:offsets[end]].tobytes())
+            self._feed(f"{name}_lengths", np.diff(offsets[start:end + 1]).tobytes())
+        for name, values in (("queries", self._queries[start:end]), ("summaries", self._summaries[start:end])):
+            # Missing values are already distinguished by the presence mask
+            try:
+                text = "\x1f".join(values)
+            except TypeError:
+                text = "\x1f".join(value or "" for value in values)
+            self._feed(name, (text + "\x1f" if values else "").encode("utf-8", "surrogatepass"))
+        extras = [[position, self._extras[position]] for position in self._extras if start <= position < end]
+        self._feed("extras", "".join(json.dumps(extra, default=str) + "\n" for extra in extras).encode("utf-8"))
+
+        # Interned names are append-only, so hash only the ones added since last time
+        for name, values in (("sentiment_labels", self.sentiment_labels), ("topics", self.topics.values),
+                             ("recommendation_texts", self._recommendations.table.values),
+                             ("clusters", self.clusters.values)):
+            seen = self._fingerprinted_values.get(name, 0)
+            self._feed(name, "".join(json.dumps(value) + "\n" for value in values[seen:]).encode("utf-8"))
+            self._fingerprinted_values[name] = len(values)
+
+    # Row decoding
+
+    def _decode(self, position, key):
+        extras = self._extras.get(position)
+        if extras is not None and key in extras:
+            return extras[key]
+        if not (key in FIELD_BITS and self._presence.view()[position] & FIELD_BITS[key]):
+            raise KeyError(key)
+        if key == "timestamp":
+            return (EPOCH + timedelta(microseconds=int(self._timestamps.view()[position]))).isoformat()
+        if key == "query":
+            return self._queries[position]
+        if key == "summary":
+            return self._summaries[position]
+        if key == "sentiment":
+            scores = self._scores.view()[3 * position:3 * position + 3]
+            return {
+                "sentiment": self.sentiment_labels[self._sentiments.view()[position]],
+                "confidence_scores": {
+                    name: round(float(score), 6) for name, score in zip(SENTIMENT_SCORE_LABELS, scores)
+                },
+            }
+        if key == "confidence":
+            return round(float(self._confidence.view()[position]), 6)
+        if key == "key_topics":
+            return self._key_topics.row(position)
+        if key == "cluster_id":
+            return self.clusters.values[self._cluster_ids.view()[position]]
+        return self._recommendations.row(position)
+
+    def column_names(self, end=None):
+        """Ordered union of the keys of rows before end (all rows by default), without decoding any row:
+        typed fields in FIELDS order, then extra keys in order of first appearance"""
+        end = len(self) if end is None else end
+        present = int(np.bitwise_or.reduce(self._presence.view()[:end])) if end else 0
+        names = {name: None for name in FIELDS if present & FIELD_BITS[name]}
+        for position in sorted(self._extras):
+            if position >= end:
+                break
+            names.update(dict.fromkeys(self._extras[position]))
+        return list(names)
+
+    def _keys(self, position):
+        presence = self._presence.view()[position]
+        keys = [name for name in FIELDS if presence & FIELD_BITS[name]]
+        extras = self._extras.get(position)
+        if extras:
+            keys.extend(key for key in extras if key not in keys)
+        return keys
+
+
+class InsightRow(Mapping):
+    """Read-only, dict-compatible view of one stored insight"""
+
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store, position):
+        self._store = store
+        self._position = position
+
+    def __getitem__(self, key):
+        return self._store._decode(self._position, key)
+
+    def __iter__(self):
+        return iter(self._store._keys(self._position))
+
+    def __len__(self):
+        return len(self._store._keys(self._position))
+
+    def __repr__(self):
+        return f"InsightRow({dict(self)!r})"
@@ -0,0 +1,108 @@
+"""
+Background job queue so analysis runs off the Streamlit script thread
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETENTION_SECONDS = 3600
+
+
+class Job:
+    """Status and outcome of one submitted job"""
+
+    __slots__ = ("id", "label", "status", "result", "error", "submitted_at", "started_at", "finished_at")
+
+    def __init__(self, job_id, label):
+        self.id = job_id
+        self.label = label
+        self.status = JOB_QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+
+class JobQueue:
+    """Runs submitted callables on a shared worker pool and tracks them by job ID.
+
+    Shared by every session in the process; each session keeps the IDs of
+    its own jobs and polls them. Finished jobs are forgotten after
+    retention_seconds.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, retention_seconds=DEFAULT_RETENTION_SECONDS):
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, label=None, **kwargs):
+        """Queue fn(*args, **kwargs) and return its job ID immediately"""
+        job = Job(uuid.uuid4().hex[:12], label)
+        with self._lock:
+            self._prune(time.time())
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        """Return the Job for job_id, or None if it is unknown or expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def poll(self, job_ids):
+        """Return {job_id: Job} for the known jobs among job_ids"""
+        with self._lock:
+            return {job_id: self._jobs[job_id] for job_id in job_ids if job_id in self._jobs}
+
+    def stats(self):
+        """Return job counts by status"""
+        counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job, fn, args, kwargs):
+        job.started_at = time.time()
+        job.status = JOB_RUNNING
+        try:
+            job.result = fn(*args, **kwargs)
+            status = JOB_DONE
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            status = JOB_FAILED
+        # Publish the status last so a finished job always has its result and finish time
+        job.finished_at = time.time()
+        job.status = status
+
+    def _prune(self, now):
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.retention_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
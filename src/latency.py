@@ -0,0 +1,170 @@
+"""
+Per-stage latency spans with rolling percentiles and metrics file export
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per stage for percentiles; counts and sums cover the whole process lifetime
+DEFAULT_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_NAME = "insights_stage_latency_seconds"
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class _Stage:
+    __slots__ = ("samples", "count", "errors", "total", "max")
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class LatencyRecorder:
+    """Thread-safe latency samples per named stage.
+
+    Recording a span is a clock read and a deque append under a lock, so it
+    can wrap every hot-path call. Percentiles are computed on demand from the
+    most recent window samples of each stage.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, clock=time.perf_counter):
+        self.window = window
+        self._clock = clock
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._last_export = None
+
+    def record(self, stage, seconds, error=False):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _Stage(self.window)
+            stats.samples.append(seconds)
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+            if error:
+                stats.errors += 1
+
+    @contextmanager
+    def span(self, stage):
+        """Time the body of a with block as one sample of stage (failures count as errors)"""
+        started = self._clock()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(stage, self._clock() - started, error)
+
+    def timed(self, stage):
+        """Decorator that records every call of the function as a span of stage"""
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                stage: (sorted(stats.samples), stats.count, stats.errors, stats.total, stats.max)
+                for stage, stats in self._stages.items()
+            }
+
+    def summary(self):
+        """Return {stage: {count, errors, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} sorted by stage.
+
+        Percentiles cover the last window samples; count, errors, mean and max cover the process lifetime.
+        """
+        summary = {}
+        for stage, (samples, count, errors, total, slowest) in sorted(self._snapshot().items()):
+            row = {"count": count, "errors": errors, "mean_ms": total / count * 1000 if count else 0.0}
+            for q in QUANTILES:
+                row[f"p{round(q * 100)}_ms"] = percentile(samples, q) * 1000
+            row["max_ms"] = slowest * 1000
+            summary[stage] = row
+        return summary
+
+    def to_prometheus(self):
+        """Render all stages in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {METRIC_NAME} Latency of app pipeline stages (quantiles over the last {self.window} calls)",
+            f"# TYPE {METRIC_NAME} summary",
+        ]
+        error_lines = []
+        for stage, (samples, count, errors, total, _) in sorted(self._snapshot().items()):
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            for q in QUANTILES:
+                lines.append(f'{METRIC_NAME}{{stage="{label}",quantile="{q}"}} {percentile(samples, q):.6f}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {total:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {count}')
+            error_lines.append(f'insights_stage_errors_total{{stage="{label}"}} {errors}')
+        if error_lines:
+            lines += ["# HELP insights_stage_errors_total Pipeline stage calls that raised",
+                      "# TYPE insights_stage_errors_total counter"] + error_lines
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Append a JSON snapshot line to a .jsonl path, or replace path with Prometheus text"""
+        if path.endswith(".jsonl"):
+            snapshot = {"timestamp": datetime.now().isoformat(timespec="seconds"), "stages": self.summary()}
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(snapshot) + "\n")
+            return
+        # Write then rename, so a scraper never reads a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def export_if_due(self, path, interval_seconds):
+        """Export at most once per interval_seconds; returns True if this call wrote the file"""
+        now = time.monotonic()
+        with self._lock:
+            if self._last_export is not None and now - self._last_export < interval_seconds:
+                return False
+            self._last_export = now
+        try:
+            self.export(path)
+        except OSError as e:
+            logger.warning(f"Failed to export latency metrics to {path}: {e}")
+            return False
+        return True
+
+
+# Process-wide recorder shared by the app's sessions and job threads
+RECORDER = LatencyRecorder()
+span = RECORDER.span
+timed = RECORDER.timed
@@ -0,0 +1,205 @@
+"""
+Near-duplicate feedback detection with MinHash and locality-sensitive hashing
+"""
+
+import copy
+import hashlib
+import re
+import threading
+import zlib
+from collections import Counter
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 5
+
+# Band layout is picked so a pair at exactly the threshold is a candidate this often
+TARGET_RECALL = 0.95
+
+# Representatives verified per text, most band collisions first; bounds work on repetitive data
+MAX_CANDIDATES_CHECKED = 16
+
+_PRIME = (1 << 31) - 1
+_DIGITS_RE = re.compile(r"\d+")
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Words that flip a sentence's meaning while barely changing its shingles
+NEGATIONS = frozenset({
+    "no", "not", "never", "none", "nobody", "nothing", "nowhere", "neither", "nor", "cannot",
+    "dont", "doesnt", "didnt", "isnt", "wasnt", "arent", "werent", "wont", "cant", "couldnt", "shouldnt",
+})
+
+
+def normalize_for_dedup(text, mask_digits=False):
+    """Lowercase and collapse whitespace; optionally mask numbers (order IDs, dates, amounts)"""
+    normalized = " ".join(str(text).lower().split())
+    return _DIGITS_RE.sub("0", normalized) if mask_digits else normalized
+
+
+def negations(text):
+    """Sorted negation words in the normalized text; texts only cluster when these match"""
+    words = _WORD_RE.findall(text.replace("\u2019", "'"))
+    return tuple(sorted(w for w in words if w.endswith("n't") or w.replace("'", "") in NEGATIONS))
+
+
+def cluster_id(text):
+    """Stable ID for the cluster represented by text"""
+    return hashlib.sha1(normalize_for_dedup(text).encode("utf-8")).hexdigest()[:12]
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE, mask_digits=False):
+    """Set of overlapping character n-grams of the normalized text"""
+    normalized = normalize_for_dedup(text, mask_digits)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def choose_bands(threshold, num_perm, target_recall=TARGET_RECALL):
+    """Return (bands, rows): the most selective layout that still finds pairs at threshold"""
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= target_recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class NearDuplicateClusterer:
+    """Groups texts whose shingle Jaccard similarity is at least threshold.
+
+    Each text is compared only against earlier cluster representatives that
+    share an LSH band with it, then confirmed with exact Jaccard, so every
+    member is similar to its representative (no chaining through members).
+    Texts with different negation words ("is working" / "is not working")
+    never cluster, however similar their shingles.
+
+    With mask_digits, numbers are masked before shingling so texts that
+    differ only in order IDs, dates or amounts cluster together - as do
+    "rating 1 of 10" and "rating 10 of 10", so it is off by default. Exact
+    repeats are always matched on the unmasked text.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1, mask_digits=False):
+        self.threshold = threshold
+        self.mask_digits = mask_digits
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self.texts_seen = 0
+        self.representatives = 0
+
+    def signature(self, shingle_set):
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64,
+                             count=len(shingle_set)) % _PRIME
+        return ((hashes[:, None] * self._a + self._b) % _PRIME).min(axis=0)
+
+    def cluster(self, texts):
+        """Return, for each text, the index of its cluster representative (itself if it leads one)"""
+        leaders = []
+        exact = {}
+        buckets = {}
+        rep_shingles = {}
+        rep_negations = {}
+        for i, text in enumerate(texts):
+            normalized = normalize_for_dedup(text)
+            if normalized in exact:
+                leaders.append(exact[normalized])
+                continue
+            shingle_set = shingles(normalized, self.shingle_size, self.mask_digits)
+            negation_words = negations(normalized)
+            leader = i
+            band_keys = []
+            if shingle_set:
+                signature = self.signature(shingle_set)
+                band_keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                             for band in range(self.bands)]
+                collisions = Counter(rep for key in band_keys for rep in buckets.get(key, ()))
+                for rep, _ in collisions.most_common(MAX_CANDIDATES_CHECKED):
+                    if (rep_negations[rep] == negation_words
+                            and jaccard(shingle_set, rep_shingles[rep]) >= self.threshold):
+                        leader = rep
+                        break
+            exact[normalized] = leader
+            leaders.append(leader)
+            if leader == i and shingle_set:
+                rep_shingles[i] = shingle_set
+                rep_negations[i] = negation_words
+                for key in band_keys:
+                    buckets.setdefault(key, []).append(i)
+
+        with self._lock:
+            self.texts_seen += len(texts)
+            self.representatives += len(set(leaders))
+        return leaders
+
+    def stats(self):
+        with self._lock:
+            return {
+                "texts": self.texts_seen,
+                "representatives": self.representatives,
+                "duplicates": self.texts_seen - self.representatives,
+            }
+
+
+def analyze_with_dedup(texts, analyze, clusterer=None, leaders=None):
+    """Run analyze() on one representative per near-duplicate cluster and fan the results out.
+
+    analyze takes a list of texts and returns one result dict per text.
+    leaders is a cluster() assignment already computed for texts (as
+    pack_clusters returns); clusterer is only used when it is None.
+    Returns (results, cluster_ids, representative_count); members get a
+    copy of their representative's result with 'query' set to their own text.
+    """
+    if leaders is None:
+        leaders = clusterer.cluster(texts)
+    representatives = sorted(set(leaders))
+    analyzed = dict(zip(representatives, analyze([texts[i] for i in representatives])))
+    results = []
+    for i, leader in enumerate(leaders):
+        result = analyzed[leader]
+        if leader != i and result is not None:
+            result = copy.deepcopy(result)
+            result["query"] = texts[i]
+        results.append(result)
+    return results, [cluster_id(texts[leader]) for leader in leaders], len(representatives)
+
+
+def pack_clusters(texts, clusterer, max_representatives):
+    """Split texts into groups that keep each cluster whole, with at most max_representatives clusters per group.
+
+    Returns (group_texts, group_leaders) pairs, where group_leaders is the
+    cluster() assignment within the group, so the group can go straight to
+    analyze_with_dedup without being clustered again.
+    """
+    leaders = clusterer.cluster(texts)
+    members = {}
+    for i, leader in enumerate(leaders):
+        members.setdefault(leader, []).append(i)
+    groups, group, representatives = [], [], 0
+    for leader in sorted(members):
+        if representatives == max_representatives:
+            groups.append(group)
+            group, representatives = [], 0
+        group.extend(members[leader])
+        representatives += 1
+    if group:
+        groups.append(group)
+
+    packed = []
+    for indices in groups:
+        position = {i: n for n, i in enumerate(indices)}
+        packed.append(([texts[i] for i in indices], [position[leaders[i]] for i in indices]))
+    return packed
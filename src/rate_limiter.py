@@ -0,0 +1,208 @@
+"""
+Token-bucket rate limiting with Retry-After-aware retries for Azure Text Analytics calls
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_PER_SECOND = 10.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY_SECONDS = 0.5
+DEFAULT_MAX_DELAY_SECONDS = 30.0
+
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+RETRY_AFTER_MS_HEADERS = ("retry-after-ms", "x-ms-retry-after-ms")
+
+
+def status_code_of(error):
+    """HTTP status of an SDK or requests error, or None"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_seconds(error):
+    """Seconds the service asked us to wait, from Retry-After style headers, or None"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    headers = {str(name).lower(): value for name, value in headers.items()}
+    for name in RETRY_AFTER_MS_HEADERS:
+        try:
+            return float(headers[name]) / 1000
+        except (KeyError, TypeError, ValueError):
+            pass
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, TypeError, ValueError):
+        # HTTP-date values are rare for this service; fall back to backoff
+        return None
+
+
+class TokenBucket:
+    """Refills at rate tokens per second up to capacity; reservations may go into debt"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def try_take(self):
+        """Take one token if one is available right now; never goes into debt"""
+        with self._lock:
+            now = self._refill()
+            if self._tokens < 1 or now < self._paused_until:
+                return False
+            self._tokens -= 1
+            return True
+
+    def pause(self, seconds):
+        """Hand out no tokens for the next seconds (the service said to back off)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RateLimiter:
+    """Process-wide limiter: one token bucket per (endpoint, action), bounded waiting and retries.
+
+    At most max_pending callers wait for a token at once; further callers
+    block until a slot frees up, so a traffic spike slows callers down
+    instead of failing them. Throttled (429) and transient failures are
+    retried with exponential backoff and full jitter, honouring Retry-After,
+    which also pauses the bucket so concurrent callers back off together.
+    """
+
+    def __init__(self, rate_per_second=DEFAULT_RATE_PER_SECOND, burst=DEFAULT_BURST,
+                 max_pending=DEFAULT_MAX_PENDING, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=DEFAULT_BASE_DELAY_SECONDS, max_delay=DEFAULT_MAX_DELAY_SECONDS,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets = {}
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.queued = 0
+        self.backpressured = 0
+        self.throttled = 0
+        self.retried = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """Build a limiter configured by AZURE_RATE_LIMIT_* environment variables"""
+        return cls(
+            rate_per_second=float(os.getenv("AZURE_RATE_LIMIT_PER_SECOND", DEFAULT_RATE_PER_SECOND)),
+            burst=int(os.getenv("AZURE_RATE_LIMIT_BURST", DEFAULT_BURST)),
+            max_pending=int(os.getenv("AZURE_RATE_LIMIT_MAX_PENDING", DEFAULT_MAX_PENDING)),
+            max_retries=int(os.getenv("AZURE_RATE_LIMIT_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+        )
+
+    def bucket(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate_per_second, self.burst, self._clock)
+            return bucket
+
+    def acquire(self, key):
+        """Block until a token for key is available; returns the seconds spent waiting"""
+        if not self._pending.acquire(blocking=False):
+            self._count("backpressured")
+            self._pending.acquire()
+        try:
+            wait = self.bucket(key).reserve()
+            if wait > 0:
+                self._count("queued")
+                self._sleep(wait)
+        finally:
+            self._pending.release()
+        with self._lock:
+            self.requests += 1
+            self.wait_seconds += wait
+        return wait
+
+    def call(self, key, fn, *args, max_retries=None, **kwargs):
+        """Call fn under the limit for key, retrying throttled and transient failures.
+
+        max_retries overrides the limiter's setting for this call. Pass 0 for
+        clients that already retry on their own, so the two retry loops do
+        not multiply; a final 429 still pauses the bucket for other callers.
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+        for attempt in range(retries + 1):
+            self.acquire(key)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                status = status_code_of(e)
+                if status not in RETRYABLE_STATUS_CODES:
+                    self._count("failed")
+                    raise
+                delay = self._retry_delay(key, e, status, attempt)
+                if attempt == retries:
+                    self._count("failed")
+                    raise
+                logger.warning(f"Request {key} got HTTP {status}; retry {attempt + 1} in {delay:.2f}s")
+                self._count("retried")
+                self._sleep(delay)
+
+    def _retry_delay(self, key, error, status, attempt):
+        if status == 429:
+            self._count("throttled")
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            # The next acquire() waits out the pause; jitter spreads out the callers it releases
+            self.bucket(key).pause(retry_after)
+            return random.uniform(0, min(retry_after, self.base_delay))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return counters for display"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "queued": self.queued,
+                "backpressured": self.backpressured,
+                "throttled": self.throttled,
+                "retried": self.retried,
+                "failed": self.failed,
+                "avg_wait_seconds": self.wait_seconds / self.requests if self.requests else 0.0,
+            }
@@ -0,0 +1,197 @@
+"""
+Content-addressed cache for NLP analysis results
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_DISK_ENTRIES = 100000
+
+# A disk hit refreshes last_access only when it is older than this, so most hits are read-only
+TOUCH_INTERVAL_SECONDS = 300
+
+# The disk tier is trimmed back to max_disk_entries once per this many puts, not on every insert
+TRIM_EVERY_PUTS = 256
+
+
+def normalize_text(text):
+    """Normalize text so trivially different inputs share a cache entry"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(text, mode, version):
+    """Hash normalized text together with the analyzer mode and version"""
+    payload = "\x1f".join([mode, version, normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier cache: in-process LRU in front of an optional SQLite store.
+
+    The LRU has its own lock and never waits on disk I/O; SQLite access is
+    serialized separately. The disk tier may briefly hold up to
+    TRIM_EVERY_PUTS rows over max_disk_entries between trims.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=None, db_path=None,
+                 max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._puts_since_trim = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access)")
+            self._db.commit()
+
+    def get(self, key):
+        """Return a copy of the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry[1], now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[0])
+            if entry is not None:
+                del self._entries[key]
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self._remember(key, value, now)
+            self.hits += 1
+            self.disk_hits += 1
+            return copy.deepcopy(value)
+
+    def put(self, key, value):
+        """Store a copy of value under key in every tier"""
+        now = time.time()
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, value, now)
+        self._disk_put(key, value, now)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value:
+                self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every cached entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters for display"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _is_fresh(self, stored_at, now):
+        return self.ttl_seconds is None or now - stored_at < self.ttl_seconds
+
+    def _remember(self, key, value, stored_at):
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key, now):
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT value, stored_at, last_access FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if not self._is_fresh(row[1], now):
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+                    return None
+                if now - row[2] >= TOUCH_INTERVAL_SECONDS:
+                    self._db.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Result cache disk read failed: {e}")
+            return None
+
+    def _disk_put(self, key, value, now):
+        if self._db is None:
+            return
+        evicted = 0
+        try:
+            payload = json.dumps(value)
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, stored_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, payload, now, now)
+                )
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= TRIM_EVERY_PUTS:
+                    self._puts_since_trim = 0
+                    evicted = self._trim_disk()
+                self._db.commit()
+        except Exception as e:
+            logger.warning(f"Result cache disk write failed: {e}")
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def _trim_disk(self):
+        """Delete the least recently used rows over max_disk_entries; returns how many"""
+        overflow = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_disk_entries
+        if overflow <= 0:
+            return 0
+        self._db.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access LIMIT ?)",
+            (overflow,)
+        )
+        return overflow
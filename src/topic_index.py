@@ -0,0 +1,98 @@
+"""
+Inverted topic index over insight history for search and topic analytics
+"""
+
+import bisect
+import heapq
+from array import array
+from collections import Counter, defaultdict
+
+from src.insight_fields import extract_topics
+
+
+class TopicIndex:
+    """Topic -> history positions, maintained incrementally as insights are added.
+
+    Posting lists are compact int64 arrays in append order, so "newest first"
+    is a reverse slice. Per-topic insight counts and topic pair co-occurrence
+    counts are updated on add, and a sorted word vocabulary answers prefix
+    searches with a binary search instead of a scan.
+    """
+
+    def __init__(self, history=None):
+        self.size = 0
+        self.postings = {}
+        self.cooccurrence = defaultdict(Counter)
+        self._words = []
+        self._top_cache = {}
+        for insight in history or []:
+            self.add(insight)
+
+    def add(self, insight):
+        """Index the topics of the insight stored at the next history position"""
+        position = self.size
+        self.size += 1
+        topics = list(dict.fromkeys(extract_topics(insight)))
+        for topic in topics:
+            posting = self.postings.get(topic)
+            if posting is None:
+                posting = self.postings[topic] = array("q")
+                for word in set(topic.lower().split()) or {""}:
+                    bisect.insort(self._words, (word, topic))
+            posting.append(position)
+        for topic in topics:
+            for other in topics:
+                if other != topic:
+                    self.cooccurrence[topic][other] += 1
+
+    def __len__(self):
+        return len(self.postings)
+
+    def count(self, topic):
+        """Number of insights mentioning topic"""
+        posting = self.postings.get(topic)
+        return len(posting) if posting is not None else 0
+
+    def top(self, k=10):
+        """Return the k topics mentioned by the most insights as (topic, count) pairs"""
+        cached = self._top_cache.get(k)
+        if cached is not None and cached[0] == self.size:
+            return list(cached[1])
+        ranked = heapq.nlargest(k, ((topic, len(posting)) for topic, posting in self.postings.items()),
+                                key=lambda item: item[1])
+        self._top_cache[k] = (self.size, ranked)
+        return list(ranked)
+
+    def related(self, topic, k=10):
+        """Return the k topics that most often appear alongside topic"""
+        return self.cooccurrence[topic].most_common(k) if topic in self.cooccurrence else []
+
+    def positions(self, topic, limit=None):
+        """Return positions of insights about topic, newest first"""
+        posting = self.postings.get(topic)
+        if posting is None:
+            return []
+        start = 0 if limit is None else max(len(posting) - limit, 0)
+        return posting[start:][::-1].tolist()
+
+    def search(self, text):
+        """Return topics with a word starting with each word of text (case-insensitive)"""
+        matches = None
+        for term in text.lower().split():
+            found = set()
+            start = bisect.bisect_left(self._words, (term, ""))
+            for word, topic in self._words[start:]:
+                if not word.startswith(term):
+                    break
+                found.add(topic)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return sorted(matches or [], key=lambda topic: -self.count(topic))
+
+    def search_positions(self, text):
+        """Return positions of insights about any topic matching text, newest first"""
+        topics = self.search(text)
+        if len(topics) == 1:
+            return self.positions(topics[0])
+        return sorted(set().union(*(self.postings[topic] for topic in topics)), reverse=True)
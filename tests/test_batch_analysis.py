@@ -0,0 +1,65 @@
+import threading
+from types import SimpleNamespace
+
+from src.batch_analysis import BatchTextAnalyzer
+
+
+class FakeClient:
+    """Stands in for TextAnalyticsClient and records request sizes per action"""
+
+    def __init__(self, fail_entities=False):
+        self.calls = {"sentiment": [], "key_phrases": [], "entities": []}
+        self.fail_entities = fail_entities
+        self._lock = threading.Lock()
+
+    def _record(self, action, documents):
+        with self._lock:
+            self.calls[action].append(len(documents))
+
+    def analyze_sentiment(self, documents):
+        self._record("sentiment", documents)
+        results = []
+        for doc in documents:
+            if doc["text"] == "":
+                results.append(SimpleNamespace(is_error=True, error=SimpleNamespace(code="InvalidDocument", message="empty")))
+            else:
+                scores = SimpleNamespace(positive=0.8, neutral=0.1, negative=0.1)
+                results.append(SimpleNamespace(is_error=False, sentiment="positive", confidence_scores=scores))
+        return results
+
+    def extract_key_phrases(self, documents):
+        self._record("key_phrases", documents)
+        return [SimpleNamespace(is_error=False, key_phrases=[doc["text"]]) for doc in documents]
+
+    def recognize_entities(self, documents):
+        self._record("entities", documents)
+        if self.fail_entities:
+            raise RuntimeError("service unavailable")
+        entity = SimpleNamespace(text="Contoso", category="Organization", confidence_score=0.9)
+        return [SimpleNamespace(is_error=False, entities=[entity]) for _ in documents]
+
+
+def test_results_are_in_input_order_and_chunked_per_action():
+    client = FakeClient()
+    texts = [f"doc {i}" for i in range(23)]
+    results = BatchTextAnalyzer(client).analyze_batch(texts)
+
+    assert [r["query"] for r in results] == texts
+    assert [r["key_phrases"] for r in results] == [[t] for t in texts]
+    assert all(r["errors"] == [] for r in results)
+    assert sorted(client.calls["sentiment"]) == [3, 10, 10]
+    assert sorted(client.calls["entities"]) == [3, 5, 5, 5, 5]
+
+
+def test_per_document_and_request_errors_are_reported():
+    client = FakeClient(fail_entities=True)
+    results = BatchTextAnalyzer(client).analyze_batch(["fine", ""])
+
+    assert results[0]["sentiment"]["sentiment"] == "positive"
+    assert [e["action"] for e in results[0]["errors"]] == ["entities"]
+    assert {e["action"] for e in results[1]["errors"]} == {"sentiment", "entities"}
+    assert results[1]["sentiment"] is None
+
+
+def test_empty_batch():
+    assert BatchTextAnalyzer(FakeClient()).analyze_batch([]) == []
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from src.batch_cli import make_chunk_analyzer, read_records, run_batch
+from src.history_export import JsonlInsightWriter
+
+
+class EchoInsightsGenerator:
+    def generate_insight(self, query, nlp_result):
+        return {
+            "query": query["text"],
+            "timestamp": query["timestamp"],
+            "sentiment": nlp_result["sentiment"],
+            "confidence": 0.75,
+            "key_topics": nlp_result["key_phrases"],
+        }
+
+
+def test_csv_to_jsonl_preserves_order_and_skips_blank_rows(tmp_path):
+    source = tmp_path / "feedback.csv"
+    rows = ["id,text,date"] + [f"{i},feedback number {i} was great,2025-12-01" for i in range(25)] + ["25,,2025-12-01"]
+    source.write_text("\n".join(rows) + "\n")
+    output = tmp_path / "insights.jsonl"
+
+    writer = JsonlInsightWriter(str(output))
+    analyze_chunk = make_chunk_analyzer(EchoInsightsGenerator())
+    read, written, failures = run_batch(read_records(str(source)), analyze_chunk, writer, chunk_size=4, workers=3)
+    writer.close()
+
+    insights = [json.loads(line) for line in output.read_text().splitlines()]
+    assert (read, written, failures) == (26, 25, 1)
+    assert [i["query"] for i in insights] == [f"feedback number {i} was great" for i in range(25)]
+    assert insights[0]["sentiment"]["sentiment"] == "positive"
+    assert insights[0]["timestamp"] == "2025-12-01"
+
+
+def test_parquet_writer_roundtrip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from src.history_export import ParquetInsightWriter
+
+    path = str(tmp_path / "insights.parquet")
+    writer = ParquetInsightWriter(path)
+    writer.write([{"query": "q", "sentiment": {"sentiment": "Positive"}, "confidence": 0.5, "key_topics": ["a"]}])
+    writer.close()
+
+    table = pq.read_table(path)
+    assert table.column("sentiment").to_pylist() == ["positive"]
+    assert table.column("key_topics").to_pylist() == [["a"]]
+
+
+def test_near_duplicates_are_analyzed_once(tmp_path):
+    from src.near_duplicates import NearDuplicateClusterer
+
+    calls = []
+
+    class CountingAnalyzer:
+        def analyze(self, texts):
+            calls.append(len(texts))
+            return [{"sentiment": {"sentiment": "negative"}, "key_phrases": ["late delivery"]} for _ in texts]
+
+    records = [{"text": f"Order {n} arrived late and support never replied to my emails"} for n in range(10)]
+    analyze_chunk = make_chunk_analyzer(
+        EchoInsightsGenerator(), demo_analyzer=CountingAnalyzer(), clusterer=NearDuplicateClusterer(0.7)
+    )
+    insights, failures = analyze_chunk(records)
+    assert failures == 0 and len(insights) == 10
+    assert sum(calls) < 10
+    assert len({insight["cluster_id"] for insight in insights}) == sum(calls)
+
+
+def test_repeated_texts_are_analyzed_once_across_chunks(tmp_path):
+    from src.result_cache import ResultCache
+
+    analyzed = []
+
+    class RecordingAnalyzer:
+        def analyze(self, texts):
+            analyzed.extend(texts)
+            return [{"sentiment": {"sentiment": "positive"}, "key_phrases": ["fast shipping"]} for _ in texts]
+
+    records = [{"text": text} for text in ["Fast shipping", "Great fit", "Fast shipping", "fast  shipping"] * 3]
+    output = tmp_path / "insights.jsonl"
+    writer = JsonlInsightWriter(str(output))
+    analyze_chunk = make_chunk_analyzer(
+        EchoInsightsGenerator(), demo_analyzer=RecordingAnalyzer(), result_cache=ResultCache(max_entries=10)
+    )
+    assert run_batch(iter(records), analyze_chunk, writer, chunk_size=2, workers=1) == (12, 12, 0)
+    writer.close()
+
+    assert sorted(analyzed) == ["Fast shipping", "Great fit", "fast  shipping"]
+    assert [json.loads(line)["query"] for line in output.read_text().splitlines()] == [r["text"] for r in records]
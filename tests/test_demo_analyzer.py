@@ -0,0 +1,121 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from src.demo_analyzer import (
+    ParallelDemoAnalyzer,
+    SentimentLexicon,
+    analyze_series_demo,
+    analyze_text_demo,
+    analyze_texts_demo,
+    demo_results_from_frame,
+)
+
+
+TEXTS = [
+    "The support team was excellent and I love the product",
+    "Terrible delivery, very disappointed",
+    "Order arrived on Tuesday",
+    "",
+] * 50
+
+
+def test_parallel_matches_serial_output():
+    serial = [analyze_text_demo(text) for text in TEXTS]
+    with ParallelDemoAnalyzer(workers=2, min_parallel_texts=0) as analyzer:
+        assert analyzer.analyze(TEXTS) == serial
+        # The pool is reused across calls
+        assert analyzer.analyze(TEXTS[:7]) == serial[:7]
+
+
+def test_threads_sharing_an_analyzer_start_one_pool(monkeypatch):
+    import src.demo_analyzer as demo_analyzer
+
+    pools = []
+
+    class SlowStartPool:
+        def __init__(self, max_workers):
+            time.sleep(0.05)
+            pools.append(self)
+
+        def map(self, fn, chunks):
+            return map(fn, chunks)
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(demo_analyzer, "ProcessPoolExecutor", SlowStartPool)
+    with ParallelDemoAnalyzer(workers=2, min_parallel_texts=0) as analyzer:
+        threads = [threading.Thread(target=analyzer.analyze, args=(TEXTS[:8],)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(pools) == 1
+
+
+def test_small_inputs_and_single_worker_stay_in_process():
+    serial = [analyze_text_demo(text) for text in TEXTS]
+    assert analyze_texts_demo(TEXTS) == serial
+    assert analyze_texts_demo(TEXTS, workers=1, min_parallel_texts=0) == serial
+
+
+def test_large_inputs_take_the_columnar_scorer(monkeypatch):
+    pytest.importorskip("pandas")
+    import src.demo_analyzer as demo_analyzer
+
+    calls = []
+    vectorized = demo_analyzer.analyze_texts_vectorized
+    monkeypatch.setattr(demo_analyzer, "analyze_texts_vectorized",
+                        lambda texts: calls.append(texts) or vectorized(texts))
+    monkeypatch.setattr(demo_analyzer, "VECTORIZED_MIN_TEXTS", 100)
+    serial = [analyze_text_demo(text) for text in TEXTS]
+    assert analyze_texts_demo(TEXTS[:50], workers=1) == serial[:50] and not calls
+    assert analyze_texts_demo(TEXTS, workers=1) == serial and len(calls) == 1
+
+
+def test_keywords_match_whole_words_only():
+    assert analyze_text_demo("goodbye to the badge office")["sentiment"]["sentiment"] == "neutral"
+    assert analyze_text_demo("I am unhappy")["sentiment"]["sentiment"] == "negative"
+
+
+def test_every_hit_counts_and_weights_apply():
+    assert analyze_text_demo("good good bad")["sentiment"]["sentiment"] == "positive"
+    lexicon = SentimentLexicon({"good": 1.0}, {"bad": 3.0})
+    assert lexicon.score("Good, good... BAD!") == (2.0, 3.0)
+    assert analyze_text_demo("good good bad", lexicon)["sentiment"]["sentiment"] == "negative"
+
+
+def test_multi_word_terms_take_precedence():
+    lexicon = SentimentLexicon({"good": 1.0}, {"not good": 2.0})
+    assert lexicon.score("the food was not good") == (0.0, 2.0)
+    assert lexicon.score("good, not bad") == (1.0, 0.0)
+
+
+def test_lexicon_from_file(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text('{"positive": {"stellar": 2}, "negative": ["meh"]}')
+    assert SentimentLexicon.from_file(str(path)).score("stellar but meh") == (2.0, 1.0)
+
+
+@pytest.mark.parametrize("block_pyarrow", [False, True])
+def test_series_scoring_matches_row_by_row_results(monkeypatch, block_pyarrow):
+    pd = pytest.importorskip("pandas")
+    if block_pyarrow:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+    extra = [None, "good good bad", "not good at all", "'Good' café's _bad_ don't GREAT!!", "  ",
+             "single", "  leading\tand   inner  spaces here", "two words"]
+    texts = pd.Series(TEXTS[:8] + extra, index=range(100, 116))
+    expected = [analyze_text_demo(text) for text in texts.fillna("")]
+
+    frame = analyze_series_demo(texts)
+    assert list(frame.index) == list(texts.index)
+    assert list(demo_results_from_frame(frame)) == expected
+
+    phrase_lexicon = SentimentLexicon({"good": 1.0}, {"not good": 2.0})
+    phrase_frame = analyze_series_demo(texts, phrase_lexicon)
+    assert list(phrase_frame["sentiment"]) == [
+        analyze_text_demo(text, phrase_lexicon)["sentiment"]["sentiment"] for text in texts.fillna("")
+    ]
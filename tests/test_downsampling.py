@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.downsampling import BYTES_PER_POINT, downsample_indices, lttb_indices, minmax_indices, point_budget
+
+
+def _series(n=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.uniform(0.5, 0.9, n).astype(np.float32)
+    y[12_345] = 0.01  # a dip that any downsampling must keep
+    y[67_890] = 0.99
+    return np.arange(1, n + 1, dtype=np.int32), y
+
+
+def test_lttb_keeps_endpoints_extremes_and_order():
+    x, y = _series()
+    kept = lttb_indices(x, y, 700)
+    assert len(kept) == 700
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert {12_345, 67_890} <= set(kept.tolist())
+
+
+def test_minmax_keeps_bucket_extremes_within_budget():
+    x, y = _series()
+    kept = minmax_indices(y, 100)
+    assert len(kept) <= 400
+    assert {0, len(y) - 1, 12_345, 67_890} <= set(kept.tolist())
+
+
+def test_short_series_and_method_none_keep_every_point_under_the_cap():
+    x, y = _series()
+    assert len(downsample_indices(x[:50], y[:50], 700)) == 50
+    x, y = _series()
+    assert len(downsample_indices(x, y, None, method="none")) == len(y)
+    assert len(downsample_indices(x, y, None)) == len(y)
+    # The payload cap still applies without width-based downsampling
+    assert 0 < len(downsample_indices(x, y, 62_500, method="none")) <= 62_500
+    with pytest.raises(ValueError):
+        downsample_indices(x, y, 700, method="every-kth")
+
+
+def test_point_budget_tracks_width_and_payload_cap():
+    assert point_budget(700) == 700
+    assert point_budget(700, "minmax") == 2800
+    assert point_budget(700, "none") is None
+    assert point_budget(700, "none", max_payload_bytes=160_000) == 10_000
+    assert point_budget(700, "minmax", max_payload_bytes=16_000) == 1000
+
+
+def test_payload_estimate_holds_for_plotly_json():
+    go = pytest.importorskip("plotly.graph_objects")
+    x, y = _series()
+    points = 10_000
+    kept = downsample_indices(x, y, points)
+    payload = len(go.Figure(go.Scattergl(x=x[kept], y=y[kept], mode="lines")).to_json())
+    assert payload <= points * BYTES_PER_POINT
@@ -0,0 +1,31 @@
+from src.figure_cache import FigureCache
+
+
+def test_figures_are_built_once_per_key_and_evicted_lru():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build(name):
+        def _build():
+            builds.append(name)
+            return {"title": name}
+        return _build
+
+    first = cache.get_or_build(("trend", "v1"), build("trend"))
+    assert cache.get_or_build(("trend", "v1"), build("trend")) is first
+    cache.get_or_build(("pie", "v1"), build("pie"))
+    cache.get_or_build(("trend", "v1"), build("trend"))
+    cache.get_or_build(("treemap", "v1"), build("treemap"))  # evicts the pie, least recently used
+    cache.get_or_build(("pie", "v1"), build("pie"))
+
+    assert builds == ["trend", "pie", "treemap", "pie"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 4, 2, 2)
+
+
+def test_empty_charts_are_cached_too():
+    cache = FigureCache()
+    builds = []
+    for _ in range(3):
+        assert cache.get_or_build("empty", lambda: builds.append(1)) is None
+    assert builds == [1]
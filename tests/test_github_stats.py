@@ -0,0 +1,49 @@
+from src.github_stats import GitHubStatsCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data or {}
+        self.headers = headers or {}
+        self.text = ""
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.request_headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.request_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_conditional_refresh_keeps_stats_on_not_modified():
+    session = FakeSession([
+        FakeResponse(200, {"stargazers_count": 5, "forks_count": 2, "html_url": "u"}, {"ETag": '"abc"'}),
+        FakeResponse(304),
+    ])
+    cache = GitHubStatsCache("owner/repo", session=session)
+
+    assert cache.refresh() and cache.stats["stars"] == 5
+    assert cache.refresh() and cache.stats["stars"] == 5
+    assert session.request_headers == [{}, {"If-None-Match": '"abc"'}]
+    assert not cache.is_stale()
+
+
+def test_get_never_blocks_and_backs_off_after_failure():
+    cache = GitHubStatsCache("owner/repo", session=FakeSession([FakeResponse(403)]))
+    scheduled = []
+    cache.refresh_async = lambda: scheduled.append(True)
+
+    assert cache.get()["stars"] == 0
+    assert scheduled == [True]
+
+    assert not cache.refresh()
+    assert not cache.is_stale()
+    cache.get()
+    assert scheduled == [True]
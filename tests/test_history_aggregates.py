@@ -0,0 +1,52 @@
+from src.history_aggregates import HistoryAggregates
+
+
+def _insight(sentiment, confidence, topics, timestamp="2025-12-01T10:00:00"):
+    return {
+        "sentiment": {"sentiment": sentiment},
+        "confidence": confidence,
+        "key_topics": topics,
+        "timestamp": timestamp,
+    }
+
+
+def test_incremental_updates_match_rebuild():
+    history = [
+        _insight("positive", 0.75, ["pricing", "support"]),
+        _insight("Negative", 0.95, ["support"], "2025-12-02T08:00:00"),
+        _insight("neutral", "n/a", None, "not a date"),
+    ]
+    incremental = HistoryAggregates()
+    for insight in history:
+        incremental.add(insight)
+    rebuilt = HistoryAggregates(history)
+
+    for aggregates in (incremental, rebuilt):
+        assert aggregates.total == 3
+        assert aggregates.sentiment_counts == {"positive": 1, "negative": 1, "neutral": 1}
+        assert aggregates.topic_counts["support"] == 2
+        assert aggregates.unique_topics == 2
+        assert aggregates.avg_confidence == 0.85
+        assert aggregates.confidence_bins[7] == 1 and aggregates.confidence_bins[9] == 1
+        assert [row["count"] for row in aggregates.timeline_rows()] == [1, 1]
+
+
+def test_empty_aggregates():
+    aggregates = HistoryAggregates()
+    assert aggregates.avg_confidence == 0
+    assert aggregates.timeline_rows() == []
+
+
+def test_timeline_rows_bucket_long_spans_into_periods():
+    history = [_insight("positive", 0.9, [], f"2025-01-{day:02d}T09:00:00") for day in range(1, 31)]
+    history.append(_insight("negative", 0.8, [], "2025-01-30T18:00:00"))
+    aggregates = HistoryAggregates(history)
+
+    assert len(aggregates.timeline_rows()) == 31
+    rows = aggregates.timeline_rows(max_periods=10)
+    assert [str(row["timestamp"]) for row in rows if row["sentiment_normalized"] == "positive"][:2] == [
+        "2025-01-01", "2025-01-04"
+    ]
+    assert sum(row["count"] for row in rows) == 31
+    assert rows[-1] == {"timestamp": rows[-1]["timestamp"], "sentiment_normalized": "positive", "count": 3}
+    assert aggregates.timeline_rows(max_periods=365) == aggregates.timeline_rows()
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src.history_export import export_csv, export_json, export_parquet, iter_history_chunks
+
+HISTORY = [
+    {"query": "great, \"quoted\"", "sentiment": {"sentiment": "positive"}, "confidence": 0.75, "key_topics": ["x"]},
+    {"query": "second", "sentiment": {"sentiment": "negative"}, "confidence": 0.9, "key_topics": [], "extra": 1},
+] * 3
+
+
+def test_chunks_stop_at_length_seen_on_entry():
+    history = list(HISTORY)
+    chunks = iter_history_chunks(history, chunk_size=4)
+    first = next(chunks)
+    history.append({"query": "late"})
+    assert [len(first)] + [len(c) for c in chunks] == [4, 2]
+
+
+def test_csv_export_has_union_of_columns_and_json_encoded_nested_values():
+    rows = list(csv.DictReader(io.StringIO(export_csv(HISTORY, chunk_size=4).decode("utf-8"))))
+    assert len(rows) == 6
+    assert list(rows[0]) == ["query", "sentiment", "confidence", "key_topics", "extra"]
+    assert rows[0]["query"] == 'great, "quoted"'
+    assert json.loads(rows[1]["sentiment"]) == {"sentiment": "negative"}
+    assert rows[0]["extra"] == "" and rows[1]["extra"] == "1"
+
+
+def test_json_export_roundtrips():
+    assert json.loads(export_json(HISTORY, chunk_size=4)) == HISTORY
+    assert json.loads(export_json([])) == []
+
+
+def test_parquet_export_writes_one_row_group_per_chunk():
+    pq = pytest.importorskip("pyarrow.parquet")
+    parquet_file = pq.ParquetFile(io.BytesIO(export_parquet(HISTORY, chunk_size=4)))
+    assert parquet_file.metadata.num_rows == 6
+    assert parquet_file.metadata.num_row_groups == 2
+    assert parquet_file.read().column("sentiment").to_pylist()[:2] == ["positive", "negative"]
+
+
+@pytest.mark.parametrize("export", [export_csv, export_json, export_parquet])
+def test_exports_are_accepted_by_deferred_download_buttons(export):
+    download_data_util = pytest.importorskip("streamlit.runtime.download_data_util")
+    if export is export_parquet:
+        pytest.importorskip("pyarrow.parquet")
+    # st.download_button(data=callable) converts the callable's return value with this helper
+    data, _ = download_data_util.convert_data_to_bytes_and_infer_mime(
+        export(HISTORY), unsupported_error=TypeError("unsupported type")
+    )
+    assert data == export(HISTORY)
@@ -0,0 +1,42 @@
+from datetime import date
+
+from src.history_index import HistoryIndex
+
+
+def _insight(sentiment, topics, day):
+    return {"sentiment": {"sentiment": sentiment}, "key_topics": topics, "timestamp": f"2025-12-{day:02d}T09:00:00"}
+
+
+HISTORY = [
+    _insight("positive", ["pricing"], 1),
+    _insight("negative", ["support", "pricing"], 2),
+    _insight("positive", ["support"], 3),
+    _insight("neutral", [], 3),
+    _insight("negative", ["support"], 5),
+]
+
+
+def test_unfiltered_pages_are_newest_first():
+    index = HistoryIndex(HISTORY)
+    assert index.query() is None
+    assert index.page(0, 2) == ([4, 3], 5)
+    assert index.page(2, 2) == ([0], 5)
+    assert index.page(3, 2) == ([], 5)
+
+
+def test_filters_intersect():
+    index = HistoryIndex(HISTORY)
+    assert index.query(sentiments=["negative"]) == [4, 1]
+    assert index.query(sentiments=["positive", "neutral"], topic="support") == [2]
+    assert index.query(topic="pricing", start_date=date(2025, 12, 2)) == [1]
+    assert index.query(start_date=date(2025, 12, 3), end_date=date(2025, 12, 4)) == [3, 2]
+    matches = index.query(topic="support")
+    assert index.page(1, 2, matches) == ([1], 3)
+
+
+def test_incremental_add_matches_rebuild():
+    index = HistoryIndex()
+    for insight in HISTORY:
+        index.add(insight)
+    assert index.days == HistoryIndex(HISTORY).days == [date(2025, 12, d) for d in (1, 2, 3, 5)]
+    assert index.query(topic="missing") == []
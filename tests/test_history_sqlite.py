@@ -0,0 +1,101 @@
+import threading
+from datetime import date
+
+import pytest
+
+from src.history_sqlite import ALL_USERS, SQLiteHistoryStore
+from src.history_store import HistoryLog
+
+
+def _insight(sentiment, confidence, timestamp):
+    return {"sentiment": {"sentiment": sentiment}, "confidence": confidence, "timestamp": timestamp}
+
+
+HISTORY = [
+    _insight("positive", 0.8, "2025-12-01T09:00:00"),
+    _insight("Negative", 0.6, "2025-12-01T17:30:00"),
+    _insight("positive", "n/a", "2025-12-03T08:00:00"),
+]
+
+
+def test_roundtrip_and_clear(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / "history.db")).partition(None)
+    store.append(HISTORY[0])
+    store.append_many(HISTORY[1:])
+    assert store.load() == HISTORY
+    store.clear()
+    assert store.load() == [] and store.count() == 0
+
+
+def test_aggregates_run_in_sql(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / "history.db")).partition(None)
+    store.append_many(HISTORY)
+    assert store.sentiment_counts() == {"positive": 2, "negative": 1}
+    assert abs(store.avg_confidence() - 0.7) < 1e-9
+    assert store.daily_sentiment_counts() == [
+        {"timestamp": "2025-12-01", "sentiment_normalized": "negative", "count": 1},
+        {"timestamp": "2025-12-01", "sentiment_normalized": "positive", "count": 1},
+        {"timestamp": "2025-12-03", "sentiment_normalized": "positive", "count": 1},
+    ]
+    assert len(store.daily_sentiment_counts(end_date=date(2025, 12, 1))) == 2
+    assert len(store.daily_sentiment_counts(start_date=date(2025, 12, 2))) == 1
+
+
+def test_concurrent_writers_do_not_lose_records(tmp_path):
+    path = str(tmp_path / "history.db")
+    stores = [SQLiteHistoryStore(path).partition(None) for _ in range(4)]
+
+    def write(store, worker):
+        for i in range(25):
+            store.append({"summary": f"{worker}-{i}"})
+
+    threads = [threading.Thread(target=write, args=(store, n)) for n, store in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stores[0].count() == 100
+    assert len({record["summary"] for record in stores[1].load()}) == 100
+
+
+def test_imports_jsonl_log_once(tmp_path):
+    log = HistoryLog(str(tmp_path / "history.jsonl"))
+    log.append_many(HISTORY)
+    path = str(tmp_path / "history.db")
+    SQLiteHistoryStore(path, import_from=log)
+    assert SQLiteHistoryStore(path, import_from=log).load(user_id=None) == HISTORY
+
+
+def test_partitions_filter_reads_writes_and_aggregates(tmp_path):
+    log = HistoryLog(str(tmp_path / "history.jsonl"))
+    log.append_many(HISTORY[:1])
+    store = SQLiteHistoryStore(str(tmp_path / "history.db"), import_from=log)
+    alice, bob = store.partition("alice"), store.partition("bob")
+    alice.append_many(HISTORY[1:])
+    bob.append(HISTORY[0])
+
+    # Imported rows have no owner and belong to the shared default partition
+    assert store.partition(None).load() == HISTORY[:1]
+    assert alice.load() == HISTORY[1:] and alice.count() == 2
+    assert alice.sentiment_counts() == {"negative": 1, "positive": 1}
+    assert abs(alice.avg_confidence() - 0.6) < 1e-9
+    assert [row["timestamp"] for row in alice.daily_sentiment_counts()] == ["2025-12-01", "2025-12-03"]
+    assert store.count(user_id=ALL_USERS) == 4
+
+    alice.clear()
+    assert alice.count() == 0 and bob.count() == 1 and store.count(user_id=ALL_USERS) == 2
+    plan = store._db.execute("EXPLAIN QUERY PLAN SELECT payload FROM insights WHERE user_id = ? ORDER BY id",
+                             ["bob"]).fetchall()
+    assert "idx_insights_user" in str(plan)
+
+
+def test_store_methods_require_a_partition(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / "history.db"))
+    for call in (store.load, store.clear, store.count, store.sentiment_counts, store.avg_confidence):
+        with pytest.raises(TypeError):
+            call()
+    with pytest.raises(TypeError):
+        store.append_many(HISTORY)
+    with pytest.raises(ValueError):
+        store.append_many(HISTORY, user_id=ALL_USERS)
+    assert not hasattr(store.partition("alice"), "partition")
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src.history_store import HistoryLog, open_history_backend
+
+
+def test_append_and_load_roundtrip(tmp_path):
+    log = HistoryLog(str(tmp_path / "history.jsonl"))
+    log.append({"summary": "one"})
+    log.append({"summary": "two"})
+    assert [r["summary"] for r in log.load()] == ["one", "two"]
+
+
+def test_clear_discards_earlier_records(tmp_path):
+    log = HistoryLog(str(tmp_path / "history.jsonl"))
+    log.append({"summary": "old"})
+    log.clear()
+    log.append({"summary": "new"})
+    assert log.load() == [{"summary": "new"}]
+
+
+def test_torn_write_does_not_corrupt_earlier_records(tmp_path):
+    path = tmp_path / "history.jsonl"
+    log = HistoryLog(str(path))
+    log.append({"summary": "kept"})
+    with open(path, "a") as f:
+        f.write('{"summary": "trunc')
+    log.append({"summary": "after"})
+    assert [r["summary"] for r in log.load()] == ["kept", "after"]
+
+
+def test_compaction_drops_dead_lines(tmp_path):
+    path = tmp_path / "history.jsonl"
+    log = HistoryLog(str(path), compact_min_dead_lines=2)
+    for i in range(3):
+        log.append({"n": i})
+    log.clear()
+    log.append({"n": 99})
+    assert log.load() == [{"n": 99}]
+    assert path.read_text().splitlines() == ['{"n": 99}']
+
+
+def test_legacy_json_file_is_migrated(tmp_path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps([{"summary": "legacy"}], indent=2))
+    log = HistoryLog(str(tmp_path / "history.jsonl"), legacy_path=str(legacy))
+    log.append({"summary": "new"})
+    assert [r["summary"] for r in log.load()] == ["legacy", "new"]
+
+
+def test_append_many_and_backend_selection(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    log = open_history_backend("jsonl", path)
+    log.append_many([{"summary": "one"}, {"summary": "two"}])
+    assert len(log.load()) == 2
+
+    store = open_history_backend("sqlite", path, db_path=str(tmp_path / "history.db"))
+    assert [r["summary"] for r in store.load(user_id=None)] == ["one", "two"]
+    with pytest.raises(ValueError):
+        open_history_backend("csv", path)
+
+
+def test_partitions_are_separate_logs(tmp_path):
+    log = HistoryLog(str(tmp_path / "history.jsonl"))
+    assert log.partition(None) is log
+    alice = log.partition("alice@example.com")
+    assert log.partition("alice@example.com") is alice and alice.path != log.path
+    log.append({"summary": "shared"})
+    alice.append({"summary": "alice"})
+    log.partition("bob@example.com").append({"summary": "bob"})
+    alice.clear()
+    assert [r["summary"] for r in log.load()] == ["shared"]
+    assert alice.load() == []
+    assert [r["summary"] for r in log.partition("bob@example.com").load()] == ["bob"]
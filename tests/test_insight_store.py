@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.history_aggregates import HistoryAggregates
+from src.history_export import export_json
+from src.insight_store import InsightStore
+
+
+def _insight(sentiment, confidence, topics, timestamp="2025-12-01T10:00:00.123456"):
+    return {
+        "timestamp": timestamp,
+        "query": f"feedback about {', '.join(topics)}",
+        "sentiment": {
+            "sentiment": sentiment,
+            "confidence_scores": {"positive": 0.7, "neutral": 0.2, "negative": 0.1},
+        },
+        "confidence": confidence,
+        "key_topics": topics,
+        "summary": f"Mostly {sentiment}",
+        "recommendations": ["Follow up with the customer"],
+    }
+
+
+def test_rows_read_back_as_appended():
+    history = [
+        _insight("positive", 0.75, ["pricing", "support"]),
+        _insight("negative", 0.95, ["support"], "2025-12-02T08:00:00"),
+    ]
+    store = InsightStore(history)
+
+    assert len(store) == 2
+    assert [dict(row) for row in store] == history
+    assert store[-1]["key_topics"] == ["support"]
+    assert store[0].get("missing", "default") == "default"
+    with pytest.raises(IndexError):
+        store[2]
+
+
+def test_unencodable_values_are_kept_verbatim():
+    odd = {
+        "timestamp": "2025-12-01T10:00:00Z",
+        "sentiment": "mixed",
+        "confidence": "n/a",
+        "key_topics": None,
+        "entities": [{"text": "Contoso"}],
+    }
+    store = InsightStore([odd, _insight("neutral", 0.5, [])])
+
+    assert dict(store[0]) == odd
+    assert "summary" not in store[0]
+    assert store[1]["sentiment"]["sentiment"] == "neutral"
+
+
+def test_columns_are_typed_and_interned():
+    store = InsightStore()
+    for i in range(1000):
+        store.append(_insight(["positive", "negative"][i % 2], 0.5, ["pricing", "support"]))
+
+    assert store.confidence_column().dtype == np.float32
+    assert store.sentiment_codes().dtype == np.int8
+    assert store.timestamp_column().dtype == np.int64
+    assert store.sentiment_labels == ["positive", "negative"]
+    topic_ids, offsets = store.topic_id_column()
+    assert store.topics.values == ["pricing", "support"]
+    assert len(topic_ids) == 2000 and offsets[-1] == 2000
+    assert store.nbytes < 64 * 1000
+
+
+def test_missing_confidence_is_nan_in_column():
+    store = InsightStore([_insight("positive", 0.75, []), {"confidence": None}])
+    assert np.isnan(store.confidence_column()[1])
+    assert HistoryAggregates(store).avg_confidence == 0.75
+
+
+def test_row_views_feed_aggregates():
+    store = InsightStore([_insight("positive", 0.75, ["pricing", "support"])])
+    aggregates = HistoryAggregates(store)
+    assert aggregates.topic_counts == {"pricing": 1, "support": 1}
+    assert aggregates.sentiment_counts == {"positive": 1}
+
+
+def test_cluster_ids_are_interned():
+    store = InsightStore([dict(_insight("negative", 0.9, []), cluster_id="abc123") for _ in range(3)])
+    assert store[2]["cluster_id"] == "abc123"
+    assert store.cluster_id_column().tolist() == [0, 0, 0]
+    assert "cluster_id" not in InsightStore([_insight("neutral", 0.5, [])])[0]
+
+
+def test_export_materializes_rows():
+    history = [_insight("positive", 0.25, ["pricing"])]
+    exported = json.loads(export_json(InsightStore(history)))
+    assert exported == history
+
+
+def test_column_names_match_row_keys_without_decoding_rows():
+    history = [{"query": "short"}, _insight("positive", 0.25, ["pricing"]), {"query": "tagged", "channel": "email"}]
+    store = InsightStore(history)
+    union = list({key: None for row in history for key in row})
+    assert store.column_names() == ["timestamp"] + [k for k in union if k != "timestamp"]
+    assert store.column_names(1) == ["query"]
+    assert InsightStore([]).column_names() == []
+
+
+def test_fingerprint_tracks_content_not_append_pattern():
+    rows = [_insight(["positive", "negative"][i % 2], i / 40, [f"topic {i % 5}"]) for i in range(40)]
+    rows[3]["channel"] = "email"
+    whole = InsightStore(rows)
+    piecewise = InsightStore()
+    for start in range(0, len(rows), 7):
+        for row in rows[start:start + 7]:
+            piecewise.append(row)
+        piecewise.fingerprint()
+    assert whole.fingerprint() == piecewise.fingerprint()
+
+    changed = InsightStore(rows[:-1] + [dict(rows[-1], confidence=0.5)])
+    assert changed.fingerprint() != whole.fingerprint()
+    shorter = InsightStore(rows[:-1])
+    before = shorter.fingerprint()
+    shorter.append(rows[-1])
+    assert shorter.fingerprint() != before
+    assert shorter.fingerprint() == whole.fingerprint()
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from src.job_queue import JobQueue, JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+
+
+def _wait(queue, job_ids, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        jobs = queue.poll(job_ids)
+        if all(job.finished for job in jobs.values()):
+            return jobs
+        time.sleep(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+def test_submit_returns_immediately_and_results_arrive():
+    queue = JobQueue(max_workers=2)
+    release = threading.Event()
+    slow = queue.submit(release.wait, label="slow")
+    fast = queue.submit(lambda x: x * 2, 21)
+
+    assert queue.get(slow).status in (JOB_QUEUED, JOB_RUNNING)
+    assert _wait(queue, [fast])[fast].result == 42
+    release.set()
+    jobs = _wait(queue, [slow, fast])
+    assert jobs[slow].status == JOB_DONE and jobs[slow].label == "slow"
+    queue.shutdown()
+
+
+def test_failures_are_reported_not_raised():
+    queue = JobQueue(max_workers=1)
+
+    def boom():
+        raise ValueError("bad input")
+
+    job_id = queue.submit(boom)
+    job = _wait(queue, [job_id])[job_id]
+    assert job.status == JOB_FAILED and job.error == "bad input"
+    assert queue.stats()[JOB_FAILED] == 1
+    queue.shutdown()
+
+
+def test_finished_jobs_expire():
+    queue = JobQueue(max_workers=1, retention_seconds=0)
+    job_id = queue.submit(lambda: None)
+    _wait(queue, [job_id])
+    time.sleep(0.01)
+    queue.submit(lambda: None)
+    assert queue.get(job_id) is None
+    assert queue.poll([job_id, "unknown"]) == {}
+    queue.shutdown()
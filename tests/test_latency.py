@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from src.latency import LatencyRecorder, percentile
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert [percentile(values, q) for q in (0.5, 0.95, 0.99)] == [50, 95, 99]
+    assert percentile([], 0.5) == 0.0
+
+
+def test_spans_and_decorator_record_latency_and_errors():
+    clock = FakeClock()
+    recorder = LatencyRecorder(clock=clock)
+
+    @recorder.timed("analysis")
+    def analyze(seconds):
+        clock.now += seconds
+        if seconds > 1:
+            raise ValueError("too slow")
+        return "ok"
+
+    assert analyze(0.25) == "ok"
+    with pytest.raises(ValueError):
+        analyze(2.0)
+    with recorder.span("persistence"):
+        clock.now += 0.5
+
+    summary = recorder.summary()
+    assert list(summary) == ["analysis", "persistence"]
+    assert summary["analysis"]["count"] == 2 and summary["analysis"]["errors"] == 1
+    assert summary["analysis"]["p50_ms"] == pytest.approx(250)
+    assert summary["analysis"]["p99_ms"] == pytest.approx(2000)
+    assert summary["persistence"]["mean_ms"] == pytest.approx(500)
+
+
+def test_percentiles_use_a_rolling_window():
+    recorder = LatencyRecorder(window=10)
+    for _ in range(100):
+        recorder.record("chart.sentiment_distribution", 1.0)
+    for _ in range(10):
+        recorder.record("chart.sentiment_distribution", 0.001)
+    row = recorder.summary()["chart.sentiment_distribution"]
+    assert row["count"] == 110
+    assert row["p99_ms"] == pytest.approx(1)
+    # The worst call is remembered after it leaves the percentile window
+    assert row["max_ms"] == pytest.approx(1000)
+
+
+def test_prometheus_and_jsonl_export(tmp_path):
+    recorder = LatencyRecorder()
+    recorder.record("analysis", 0.2)
+    recorder.record("analysis", 0.4, error=True)
+
+    text = recorder.to_prometheus()
+    assert '# TYPE insights_stage_latency_seconds summary' in text
+    assert 'insights_stage_latency_seconds{stage="analysis",quantile="0.5"} 0.200000' in text
+    assert 'insights_stage_latency_seconds_count{stage="analysis"} 2' in text
+    assert 'insights_stage_errors_total{stage="analysis"} 1' in text
+
+    prom_path = str(tmp_path / "metrics.prom")
+    assert recorder.export_if_due(prom_path, 60)
+    assert not recorder.export_if_due(prom_path, 60)
+    assert open(prom_path).read() == text
+
+    jsonl_path = str(tmp_path / "latency.jsonl")
+    recorder.export(jsonl_path)
+    recorder.export(jsonl_path)
+    snapshots = [json.loads(line) for line in open(jsonl_path)]
+    assert len(snapshots) == 2 and snapshots[0]["stages"]["analysis"]["count"] == 2
@@ -0,0 +1,73 @@
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import load_generator  # noqa: E402
+from mock_text_analytics import MockTextAnalyticsServer  # noqa: E402
+from src.rate_limiter import RateLimiter  # noqa: E402
+
+
+def _post(server, action, count):
+    documents = [{"id": str(i), "text": "Great service"} for i in range(count)]
+    request = urllib.request.Request(f"{server.endpoint}/text/analytics/v3.1/{action}",
+                                     json.dumps({"documents": documents}).encode())
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.load(e)
+
+
+def test_mock_enforces_batch_limits_quota_and_injected_failures():
+    with MockTextAnalyticsServer(max_rps=2, retry_after_seconds=3) as server:
+        assert _post(server, "sentiment", 11)[0] == 400
+        assert [_post(server, "sentiment", 10)[0] for _ in range(3)] == [200, 200, 429]
+        status, headers, body = _post(server, "keyPhrases", 1)
+        assert status == 429 and headers["Retry-After"] == "3" and body["error"]["code"] == "429"
+        assert server.stats() == {"requests": 5, "documents": 20, "throttled": 2, "errors": 0, "rejected": 1}
+
+    with MockTextAnalyticsServer(error_rate=1.0) as server:
+        assert _post(server, "sentiment", 1)[0] == 500
+
+
+def test_run_load_paces_flows_and_summarizes_tail_latency():
+    calls = []
+
+    def flow(text):
+        calls.append(text)
+        if text == "bad":
+            raise ValueError("boom")
+
+    outcomes, elapsed = load_generator.run_load(flow, ["a", "b", "bad", "c"], rps=200, duration=0.1)
+    assert len(calls) == 20 and elapsed >= 0.09
+
+    report = load_generator.summarize(outcomes, elapsed, 200)
+    assert (report["flows"], report["succeeded"], report["failed"]) == (20, 15, 5)
+    assert report["errors"] == {"ValueError": 5}
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+
+
+def test_batch_flow_rides_out_throttling_through_the_rate_limiter():
+    pytest.importorskip("azure.ai.textanalytics")
+    limiter = RateLimiter(rate_per_second=1000, burst=100, base_delay=0.01)
+    with MockTextAnalyticsServer(throttle_rate=0.3, retry_after_seconds=0, seed=7) as server:
+        flow = load_generator.make_batch_flow(server.endpoint, "mock-key", limiter)
+        for _ in range(3):
+            flow(["I love the new app", "Terrible support from Contoso", "Order arrived"])
+        assert server.stats()["throttled"] > 0
+    assert limiter.stats()["failed"] == 0
+
+
+def test_missing_service_modules_are_reported_without_a_traceback(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "src.insights_generator", None)
+    monkeypatch.setitem(sys.modules, "src.nlp_processor", None)
+    assert load_generator.main(["--duration", "0.1"]) == 2
+    assert "Insight generation unavailable" in capsys.readouterr().err
+    assert load_generator.main(["--analysis-only", "--duration", "0.1"]) == 2
+    assert "Query flows unavailable" in capsys.readouterr().err
@@ -0,0 +1,93 @@
+import pytest
+
+from src.near_duplicates import (
+    NearDuplicateClusterer, analyze_with_dedup, choose_bands, cluster_id, jaccard, negations, pack_clusters, shingles
+)
+
+TEMPLATE = "My order #{} arrived two weeks late and nobody from support answered my emails."
+
+
+def test_near_identical_texts_share_a_representative():
+    texts = [
+        TEMPLATE.format(1001),
+        "The new dashboard is fast and easy to use.",
+        TEMPLATE.format(1002),
+        "  the NEW dashboard is fast and easy to use.  ",
+        TEMPLATE.format(2093) + "!",
+        "Completely unrelated note about invoices and billing cycles.",
+    ]
+    assert NearDuplicateClusterer(threshold=0.8).cluster(texts) == [0, 1, 0, 1, 0, 5]
+
+
+def test_members_are_similar_to_their_representative():
+    texts = [TEMPLATE.format(n) for n in range(200)] + [f"Feedback item {n} about topic {n * 7}" for n in range(50)]
+    clusterer = NearDuplicateClusterer(threshold=0.7)
+    leaders = clusterer.cluster(texts)
+    for i, leader in enumerate(leaders):
+        assert leader <= i
+        assert jaccard(shingles(texts[i]), shingles(texts[leader])) >= 0.7 or texts[i].lower() == texts[leader].lower()
+    assert len(set(leaders[:200])) < 10
+    assert clusterer.stats()["texts"] == 250
+
+
+def test_high_threshold_keeps_distinct_texts_apart():
+    texts = ["The product is great", "The product is terrible", "", ""]
+    assert NearDuplicateClusterer(threshold=0.95).cluster(texts) == [0, 1, 2, 2]
+
+
+def test_band_layout_favours_recall_at_threshold():
+    bands, rows = choose_bands(0.9, 64)
+    assert bands * rows <= 64
+    assert 1 - (1 - 0.9 ** rows) ** bands >= 0.95
+
+
+def test_analyze_with_dedup_fans_out_results():
+    texts = [TEMPLATE.format(1), TEMPLATE.format(2), "Something else entirely, about pricing."]
+    analyzed = []
+
+    def analyze(batch):
+        analyzed.extend(batch)
+        return [{"query": text, "sentiment": {"sentiment": "negative"}} for text in batch]
+
+    results, cluster_ids, count = analyze_with_dedup(texts, analyze, NearDuplicateClusterer(threshold=0.8))
+    assert analyzed == [texts[0], texts[2]] and count == 2
+    assert [r["query"] for r in results] == texts
+    assert results[1] is not results[0]
+    assert cluster_ids[0] == cluster_ids[1] == cluster_id(texts[0]) != cluster_ids[2]
+
+
+def test_pack_clusters_keeps_clusters_whole():
+    texts = [TEMPLATE.format(n) for n in range(5)] + [
+        "The checkout page froze twice.", "Love the new dark theme!", "Shipping costs are far too high.",
+        "Support resolved my issue quickly.", "Search never finds what I need.",
+    ]
+    clusterer = NearDuplicateClusterer(threshold=0.8)
+    groups = pack_clusters(texts, clusterer, max_representatives=2)
+    assert sorted(text for group, _ in groups for text in group) == sorted(texts)
+    assert groups[0][0][:5] == texts[:5]
+    assert [len(group) for group, _ in groups] == [6, 2, 2]
+    assert groups[0][1] == [0, 0, 0, 0, 0, 5] and groups[1][1] == [0, 1]
+
+    # The packed assignment is reused, so each text is clustered once
+    analyzed = []
+    for group, leaders in groups:
+        analyze_with_dedup(group, lambda batch: analyzed.extend(batch) or [{} for _ in batch], leaders=leaders)
+    assert len(analyzed) == 6
+    assert clusterer.stats()["texts"] == len(texts)
+
+
+def test_texts_differing_only_in_numbers_merge_only_when_masking():
+    texts = ["Rating 1 out of 10", "Rating 10 out of 10", "rating 1  OUT of 10"]
+    assert NearDuplicateClusterer(threshold=1.0).cluster(texts) == [0, 1, 0]
+    assert NearDuplicateClusterer(threshold=1.0, mask_digits=True).cluster(texts) == [0, 0, 0]
+
+
+def test_negated_texts_never_merge():
+    texts = [
+        "The checkout page is working on mobile since the last update",
+        "The checkout page is not working on mobile since the last update",
+        "The checkout page isn\u2019t working on mobile since the last update",
+    ]
+    assert jaccard(shingles(texts[0]), shingles(texts[1])) >= 0.8
+    assert negations(texts[2].lower()) == ("isn't",)
+    assert NearDuplicateClusterer(threshold=0.8).cluster(texts) == [0, 1, 2]
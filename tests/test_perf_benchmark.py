@@ -0,0 +1,79 @@
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import perf_benchmark  # noqa: E402
+from mock_text_analytics import MockTextAnalyticsServer  # noqa: E402
+
+
+@pytest.fixture
+def unstub():
+    """Drop the service stubs and the app module a suite run imported"""
+    yield
+    for name in list(perf_benchmark._STUBS) + ["app"]:
+        sys.modules.pop(name, None)
+    perf_benchmark._STUBS.clear()
+
+
+def test_synthetic_insights_are_deterministic_and_well_formed():
+    first = list(perf_benchmark.synthetic_insights(50, seed=3))
+    assert first == list(perf_benchmark.synthetic_insights(50, seed=3))
+    for insight in first:
+        scores = insight["sentiment"]["confidence_scores"]
+        assert max(scores, key=scores.get) == insight["sentiment"]["sentiment"]
+        assert 1 <= len(insight["key_topics"]) <= 4
+    assert first[0]["timestamp"] < first[-1]["timestamp"]
+
+
+def test_suite_report_is_json_and_compares_against_baseline(tmp_path, unstub):
+    report = perf_benchmark.run_suite(sizes=[20], texts=10, repeat=1, include_app=False, include_azure=False,
+                                      stub_missing=True)
+    assert {"analyze_text_demo", "save_history_sqlite[20]", "export_json[20]"} <= set(report["results"])
+    assert json.loads(json.dumps(report)) == report
+
+    current = {"results": {"slower": {"median_ms": 30.0}, "steady": {"median_ms": 10.0}, "tiny": {"median_ms": 0.5}}}
+    baseline = {"results": {"slower": {"median_ms": 20.0}, "steady": {"median_ms": 9.0}, "tiny": {"median_ms": 0.1}}}
+    problems = perf_benchmark.compare_reports(current, baseline, max_regression=0.25)
+    assert [problem.split(":")[0] for problem in problems] == ["slower"]
+
+
+def test_missing_sections_fail_instead_of_being_skipped(unstub, monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "app", None)
+    assert perf_benchmark.main(["--sizes", "10", "--texts", "5", "--repeat", "1", "--no-azure", "--stub-missing"]) == 2
+    assert "import app failed" in capsys.readouterr().err
+    monkeypatch.setitem(sys.modules, "src.insights_generator", None)
+    with pytest.raises(perf_benchmark.BenchmarkUnavailable, match="--stub-missing"):
+        perf_benchmark.bench_text_analysis(["text"], repeat=1)
+
+
+def test_app_wrappers_and_charts_are_timed_with_stubbed_services(unstub):
+    report = perf_benchmark.run_suite(sizes=[20], texts=10, repeat=1, include_azure=False, stub_missing=True)
+    assert report["stubbed"] == list(perf_benchmark.SERVICE_MODULES)
+    names = set(report["results"])
+    assert {"app_save_session_history_jsonl[20]", "app_load_session_history_sqlite[20]"} <= names
+    assert any(name.startswith("create_") for name in names)
+    assert "generate_insight" not in names
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def test_mock_text_analytics_serves_v3_and_analyze_text_routes():
+    documents = [{"id": "0", "text": "I love the new Contoso app"}, {"id": "1", "text": "Terrible support"}]
+    with MockTextAnalyticsServer() as server:
+        sentiment = _post(f"{server.endpoint}/text/analytics/v3.1/sentiment", {"documents": documents})
+        entities = _post(f"{server.endpoint}/language/:analyze-text?api-version=2023-04-01",
+                         {"kind": "EntityRecognition", "analysisInput": {"documents": documents}})
+        assert (server.requests, server.documents) == (2, 4)
+
+    assert [doc["sentiment"] for doc in sentiment["documents"]] == ["positive", "negative"]
+    assert entities["kind"] == "EntityRecognitionResults"
+    assert [entity["text"] for entity in entities["results"]["documents"][0]["entities"]] == ["Contoso"]
@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.batch_analysis import BatchTextAnalyzer
+from src.rate_limiter import RateLimiter, TokenBucket, retry_after_seconds
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class HttpError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+def _limiter(clock, **kwargs):
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_bucket_allows_burst_then_paces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_try_take_refuses_without_going_into_debt():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.try_take() for _ in range(4)] == [True, True, False, False]
+    clock.now += 0.5
+    assert bucket.try_take() and not bucket.try_take()
+
+
+def test_limiter_waits_instead_of_failing_and_counts_queued():
+    clock = FakeClock()
+    limiter = _limiter(clock, rate_per_second=5, burst=1)
+    for _ in range(6):
+        limiter.call(("endpoint", "sentiment"), lambda: None)
+    assert clock.now == pytest.approx(1.0)
+    assert limiter.stats()["queued"] == 5
+    # Separate actions have separate buckets
+    limiter.call(("endpoint", "entities"), lambda: None)
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_throttled_calls_honour_retry_after_then_succeed():
+    clock = FakeClock()
+    limiter = _limiter(clock, rate_per_second=100, burst=10)
+    responses = [HttpError(429, {"Retry-After": "3"}), HttpError(503), "ok"]
+
+    def flaky():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert limiter.call("key", flaky) == "ok"
+    assert clock.now >= 3
+    stats = limiter.stats()
+    assert (stats["throttled"], stats["retried"], stats["failed"]) == (1, 2, 0)
+
+
+def test_non_retryable_and_exhausted_errors_raise():
+    clock = FakeClock()
+    limiter = _limiter(clock, max_retries=2)
+
+    def bad_request():
+        raise HttpError(400)
+
+    def always_throttled():
+        raise HttpError(429)
+
+    with pytest.raises(HttpError):
+        limiter.call("key", bad_request)
+    with pytest.raises(HttpError):
+        limiter.call("key", always_throttled)
+    stats = limiter.stats()
+    assert stats["retried"] == 2 and stats["failed"] == 2
+
+
+def test_retry_after_headers():
+    assert retry_after_seconds(HttpError(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(HttpError(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_batch_analyzer_retries_through_limiter():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+    calls = []
+
+    def analyze_sentiment(documents):
+        calls.append(len(documents))
+        if len(calls) == 1:
+            raise HttpError(429, {"Retry-After": "1"})
+        scores = SimpleNamespace(positive=0.9, neutral=0.05, negative=0.05)
+        return [SimpleNamespace(is_error=False, sentiment="positive", confidence_scores=scores) for _ in documents]
+
+    client = SimpleNamespace(
+        analyze_sentiment=analyze_sentiment,
+        extract_key_phrases=lambda documents: [SimpleNamespace(is_error=False, key_phrases=[]) for _ in documents],
+        recognize_entities=lambda documents: [SimpleNamespace(is_error=False, entities=[]) for _ in documents],
+    )
+    results = BatchTextAnalyzer(client, max_workers=1, rate_limiter=limiter).analyze_batch(["great"])
+    assert results[0]["errors"] == []
+    assert results[0]["sentiment"]["sentiment"] == "positive"
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_per_call_retry_override_leaves_retries_to_the_client():
+    clock = FakeClock()
+    limiter = _limiter(clock, max_retries=3)
+    attempts = []
+
+    def throttled():
+        attempts.append(clock.now)
+        raise HttpError(429, {"Retry-After": "2"})
+
+    with pytest.raises(HttpError):
+        limiter.call("key", throttled, max_retries=0)
+    stats = limiter.stats()
+    assert len(attempts) == 1
+    assert (stats["throttled"], stats["retried"], stats["failed"]) == (1, 0, 1)
+    # The Retry-After still holds back the next caller
+    limiter.acquire("key")
+    assert clock.now >= 2
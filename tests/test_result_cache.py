@@ -0,0 +1,67 @@
+from src.result_cache import ResultCache, make_cache_key
+
+
+def test_key_normalizes_whitespace_and_separates_modes():
+    assert make_cache_key("good  service\n", "demo", "1") == make_cache_key("good service", "demo", "1")
+    assert make_cache_key("good service", "demo", "1") != make_cache_key("good service", "azure", "1")
+    assert make_cache_key("good service", "demo", "1") != make_cache_key("good service", "demo", "2")
+
+
+def test_lru_eviction_and_counters():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+
+def test_ttl_expiry():
+    cache = ResultCache(ttl_seconds=0)
+    cache.put("a", {"v": 1})
+    assert cache.get("a") is None
+
+
+def test_returned_values_are_copies():
+    cache = ResultCache()
+    cache.put("a", {"items": [1]})
+    cache.get("a")["items"].append(2)
+    assert cache.get("a") == {"items": [1]}
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite")
+    ResultCache(db_path=db_path).put("a", {"v": 1})
+    cache = ResultCache(db_path=db_path)
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_get_or_compute_skips_empty_results():
+    cache = ResultCache()
+    assert cache.get_or_compute("a", lambda: None) is None
+    assert cache.get_or_compute("a", lambda: {"v": 1}) == {"v": 1}
+    assert cache.get_or_compute("a", lambda: {"v": 2}) == {"v": 1}
+
+
+def test_disk_hits_are_read_only_and_trims_are_batched(tmp_path, monkeypatch):
+    import src.result_cache as result_cache
+
+    monkeypatch.setattr(result_cache, "TRIM_EVERY_PUTS", 4)
+    db_path = str(tmp_path / "cache.sqlite")
+    writer = ResultCache(db_path=db_path, max_disk_entries=2)
+    statements = []
+    writer._db.set_trace_callback(statements.append)
+    for key in "abcde":
+        writer.put(key, {"v": key})
+    assert sum("COUNT(*)" in statement for statement in statements) == 1
+    assert writer.stats()["evictions"] == 2
+
+    reader = ResultCache(db_path=db_path, max_entries=1)
+    reader._db.set_trace_callback(statements.append)
+    statements.clear()
+    assert reader.get("e") == {"v": "e"}
+    assert reader.get("d") == {"v": "d"} and reader.get("e") == {"v": "e"}
+    assert not any(statement.startswith("UPDATE") for statement in statements)
@@ -0,0 +1,56 @@
+from src.history_index import HistoryIndex
+from src.topic_index import TopicIndex
+
+
+def _insight(*topics):
+    return {"key_topics": list(topics)}
+
+
+HISTORY = [
+    _insight("pricing", "customer support"),
+    _insight("support tickets", "pricing", "pricing"),
+    _insight("shipping"),
+    _insight("Customer Support", "shipping"),
+    _insight(),
+]
+
+
+def test_counts_and_top_topics():
+    index = TopicIndex(HISTORY)
+    assert len(index) == 5
+    assert index.count("pricing") == 2
+    assert index.top(2) == [("pricing", 2), ("shipping", 2)]
+    assert index.related("pricing") == [("customer support", 1), ("support tickets", 1)]
+    assert index.related("unknown") == []
+
+
+def test_positions_are_newest_first():
+    index = TopicIndex(HISTORY)
+    assert index.positions("shipping") == [3, 2]
+    assert index.positions("shipping", limit=1) == [3]
+    assert index.positions("missing") == []
+
+
+def test_search_matches_word_prefixes_case_insensitively():
+    index = TopicIndex(HISTORY)
+    assert set(index.search("supp")) == {"customer support", "support tickets", "Customer Support"}
+    assert set(index.search("CUSTOMER supp")) == {"customer support", "Customer Support"}
+    assert index.search("billing") == []
+    assert index.search_positions("support") == [3, 1, 0]
+
+
+def test_incremental_add_matches_rebuild():
+    index = TopicIndex()
+    for insight in HISTORY:
+        index.add(insight)
+    rebuilt = TopicIndex(HISTORY)
+    assert index.postings == rebuilt.postings
+    assert index.cooccurrence == rebuilt.cooccurrence
+
+
+def test_history_index_topic_search_combines_with_filters():
+    history = [dict(insight, sentiment="negative" if i % 2 else "positive") for i, insight in enumerate(HISTORY)]
+    index = HistoryIndex(history)
+    assert index.query(topic_search="support") == [3, 1, 0]
+    assert index.query(sentiments=["negative"], topic_search="support") == [3, 1]
+    assert index.query(topic="pricing", topic_search="ship") == []